@@ -33,11 +33,9 @@ from typing import List, Tuple, Dict
 def XOR_CRC_calculation(msg):
     """Calculate XOR checksum per PDF Page 12."""
     checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
+    for byte in msg.encode('ascii'):
         checksum ^= byte
-    return str(hex(checksum)[2:]).upper().zfill(2)
+    return format(checksum, '02X')
 
 
 def create_lowa_msg(head, uid, command, data):
@@ -125,8 +125,8 @@ class DigiSensInterface:
             Two-character hexadecimal checksum
         """
         checksum = 0
-        for char in message:
-            checksum ^= ord(char)
+        for byte in message.encode('ascii'):
+            checksum ^= byte
         return f"{checksum:02X}"
 
     def _build_command(self, command: str, mux_id: str, channel: Optional[int] = None,
@@ -11,11 +11,9 @@ def create_lowa_msg(head, uid, command, data):
  
 def XOR_CRC_calculation(msg):
     checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
+    for byte in msg.encode('ascii'):
         checksum ^= byte
-    return str(hex(checksum)[2:]).upper()
+    return format(checksum, '02X')
 
 ser = serial.Serial()
 ser.baudrate = 9600
@@ -75,11 +73,9 @@ def create_lowa_msg(head, uid, command, data):
  
 def XOR_CRC_calculation(msg):
     checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
+    for byte in msg.encode('ascii'):
         checksum ^= byte
-    return str(hex(checksum)[2:]).upper()
+    return format(checksum, '02X')
 
 ser = serial.Serial()
 ser.baudrate = 9600
@@ -26,84 +26,7 @@ import threading
 import time
 from typing import List, Tuple, Optional
 
-
-def XOR_CRC_calculation(msg):
-    """
-    Calculate XOR checksum per PDF Page 12, Section 4.3.
-
-    "The checksum is a XOR on all previous bytes (including "@") modulo 0xFF,
-    in Hexadecimal ASCII."
-    """
-    checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
-        checksum ^= byte
-    return str(hex(checksum)[2:]).upper().zfill(2)
-
-
-def create_lowa_msg(head, uid, command, data):
-    """
-    Build LOWA protocol message per PDF Page 12, Section 4.2.
-
-    Verified against PDF examples:
-    - @09sz123040 (Page 12)
-    - @08gl12373 (Page 14)
-    """
-    c_length = str(len(head + "00" + command + uid + data))
-    msg = head + c_length.zfill(2) + command + uid + data
-    msg_crc = XOR_CRC_calculation(msg)
-    msg += msg_crc
-    return msg + "\r"
-
-
-def parse_gd_weight_response(response, channel_idx):
-    """
-    Parse 'gd' command response per PDF Page 22-23, Section 4.8.1.
-
-    Response format: @|14|swwwwwwwwwx|CC|CR
-    - Position 0: @ or #
-    - Position 1-2: Length (14)
-    - Position 3: Sign (space or -)
-    - Position 4-12: Weight (9 chars with decimal)
-    - Position 13: Status flag
-    - Position 14-15: Checksum
-
-    Args:
-        response: Full response string (e.g., "@14 14000.000 6E")
-        channel_idx: Channel number
-
-    Returns:
-        Tuple of (channel, weight, status, valid)
-    """
-    # Remove prefix and length: skip first 3 chars
-    data = response[3:]
-
-    # Extract components
-    sign = data[0]
-    weight_str = data[1:10].strip()  # 9 characters for weight
-    status_char = data[10]
-
-    # Parse weight
-    try:
-        weight = float(weight_str)
-        if sign == '-':
-            weight = -weight
-    except ValueError:
-        weight = 0.0
-        status_char = 'E'
-
-    # Parse status per PDF Page 24-26
-    status_map = {
-        ' ': 'OK',
-        'M': 'MOTION',
-        'C': 'NOT_CONNECTED',
-        'E': 'EEPROM_ERROR'
-    }
-    status = status_map.get(status_char, 'UNKNOWN')
-    valid = (status_char == ' ')
-
-    return (channel_idx, weight, status, valid)
+from lowa_protocol import build_frame, parse_gd
 
 
 def read_single_weight_gd(port, mux_id, channel, baudrate=9600, use_extended=True, timeout=0.5):
@@ -138,7 +61,7 @@ def read_single_weight_gd(port, mux_id, channel, baudrate=9600, use_extended=Tru
         channel_str = str(channel)
         data_mode = "0"  # 0 = weight mode
 
-        msg = create_lowa_msg(head, mux_id, "gd", channel_str + data_mode)
+        msg = build_frame(head, mux_id, "gd", channel_str + data_mode)
 
         # Send command
         ser.write(str.encode(msg))
@@ -151,7 +74,7 @@ def read_single_weight_gd(port, mux_id, channel, baudrate=9600, use_extended=Tru
             return (False, channel, 0.0, "TIMEOUT", False, "No response or timeout")
 
         # Parse response
-        channel_idx, weight, status, valid = parse_gd_weight_response(response, channel)
+        channel_idx, weight, status, valid = parse_gd(response, channel)
 
         ser.close()
         return (True, channel_idx, weight, status, valid, None)
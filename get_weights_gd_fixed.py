@@ -7,55 +7,30 @@ Keeps serial port open while reading all channels (like fabio_2.py)
 Based on K321e-06_lowa_protocol.pdf Section 4.8.1 (Page 22-23)
 """
 
+import asyncio
 import serial
+import sys
 import threading
 import time
 
+try:
+    import serial_asyncio
+except ImportError:  # pyserial-asyncio is optional, threads are used instead
+    serial_asyncio = None
 
-def XOR_CRC_calculation(msg):
-    """Calculate XOR checksum per PDF Page 12."""
-    checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
-        checksum ^= byte
-    return str(hex(checksum)[2:]).upper().zfill(2)
+from lowa_protocol import (
+    adaptive_timeout, discard_input, gd_frames, parse_gd, record_response, record_timeout,
+    rtt_state
+)
 
 
-def create_lowa_msg(head, uid, command, data):
-    """Build LOWA protocol message per PDF Page 12."""
-    c_length = str(len(head + "00" + command + uid + data))
-    msg = head + c_length.zfill(2) + command + uid + data
-    msg_crc = XOR_CRC_calculation(msg)
-    msg += msg_crc
-    return msg + "\r"
-
-
-def parse_gd_response(response, channel_idx):
-    """Parse 'gd' response: @|14|swwwwwwwwwx|CC|CR"""
-    try:
-        data = response[3:]  # Skip prefix and length
-        sign = data[0]
-        weight_str = data[1:10].strip()  # 9 chars
-        status_char = data[10]
-
-        weight = float(weight_str)
-        if sign == '-':
-            weight = -weight
-
-        status_map = {' ': 'OK', 'M': 'MOTION', 'C': 'NOT_CONNECTED', 'E': 'EEPROM_ERROR'}
-        status = status_map.get(status_char, 'UNKNOWN')
-        valid = (status_char == ' ')
-
-        return (channel_idx, weight, status, valid)
-    except Exception as e:
-        return (channel_idx, 0.0, f"PARSE_ERROR({e})", False)
-
-
-def read_all_weights_gd(port, mux_id, num_channels=8, baudrate=9600, use_extended=True):
+def read_all_weights_gd(port, mux_id, num_channels=8, baudrate=9600, use_extended=True, timeout=0.5):
     """
     Read all weights using 'gd' command.
     FIXED: Keeps serial port open for all reads (like fabio_2.py).
+
+    The per-channel read timeout adapts to the MUX's observed response
+    time, with `timeout` as the upper bound.
     """
     weights = []
 
@@ -63,7 +38,7 @@ def read_all_weights_gd(port, mux_id, num_channels=8, baudrate=9600, use_extende
         # Open serial port ONCE
         ser = serial.Serial()
         ser.baudrate = baudrate
-        ser.timeout = 0.5  # 500ms timeout per channel
+        ser.timeout = timeout
         ser.port = port
         ser.open()
 
@@ -73,23 +48,26 @@ def read_all_weights_gd(port, mux_id, num_channels=8, baudrate=9600, use_extende
 
         # Read each channel
         head = '#' if use_extended else '@'
+        rtt = rtt_state(port, mux_id, timeout)
 
-        for channel in range(num_channels):
+        for channel, frame in enumerate(gd_frames(head, mux_id, num_channels)):
             try:
-                # Build command: gd + channel + mode(0=weight)
-                msg = create_lowa_msg(head, mux_id, "gd", str(channel) + "0")
-
-                # Send command
-                ser.write(str.encode(msg))
-                ser.flush()
+                # Send command: gd + channel + mode(0=weight)
+                ser.timeout = adaptive_timeout(rtt, timeout)
+                # Drop any late reply to the previous channel
+                ser.reset_input_buffer()
+                sent = time.monotonic()
+                ser.write(frame)
 
                 # Read response
                 response = ser.read_until(b"\r").decode("utf-8")
 
                 if response and len(response) >= 14:
-                    ch, weight, status, valid = parse_gd_response(response, channel)
+                    record_response(rtt, time.monotonic() - sent)
+                    ch, weight, status, valid = parse_gd(response, channel)
                     weights.append((ch, weight, status, valid))
                 else:
+                    record_timeout(rtt, timeout)
                     weights.append((channel, 0.0, "NO_RESPONSE", False))
 
             except Exception as e:
@@ -104,6 +82,92 @@ def read_all_weights_gd(port, mux_id, num_channels=8, baudrate=9600, use_extende
         return (False, [], f"Serial error: {e}")
 
 
+async def read_all_weights_gd_async(reader, writer, mux_id, num_channels=8, use_extended=True, timeout=0.5):
+    """
+    Read all weights using 'gd' command over a serial_asyncio stream pair.
+
+    Same request/response flow as read_all_weights_gd(), but waits on the
+    event loop so one thread can drive any number of ports.
+    """
+    weights = []
+    head = '#' if use_extended else '@'
+    rtt = rtt_state(writer.transport.serial.port, mux_id, timeout)
+
+    for channel, frame in enumerate(gd_frames(head, mux_id, num_channels)):
+        try:
+            # Send command: gd + channel + mode(0=weight)
+            # Drop any late reply to the previous channel
+            discard_input(reader, writer)
+            sent = time.monotonic()
+            writer.write(frame)
+            await writer.drain()
+
+            # Read response
+            try:
+                response = await asyncio.wait_for(
+                    reader.readuntil(b"\r"), adaptive_timeout(rtt, timeout)
+                )
+                response = response.decode("utf-8")
+            except asyncio.TimeoutError:
+                response = ""
+
+            if response and len(response) >= 14:
+                record_response(rtt, time.monotonic() - sent)
+                ch, weight, status, valid = parse_gd(response, channel)
+                weights.append((ch, weight, status, valid))
+            else:
+                record_timeout(rtt, timeout)
+                weights.append((channel, 0.0, "NO_RESPONSE", False))
+
+        except Exception as e:
+            weights.append((channel, 0.0, f"ERROR({e})", False))
+
+    return (True, weights, None)
+
+
+async def read_mux_async(port, mux_id, baudrate, use_extended, label):
+    """Coroutine counterpart of read_mux_thread(); returns the result dict."""
+    print(f"[{label}] Reading from {port}...")
+    start_time = time.time()
+
+    try:
+        reader, writer = await serial_asyncio.open_serial_connection(url=port, baudrate=baudrate)
+        try:
+            success, weights, error = await read_all_weights_gd_async(
+                reader, writer, mux_id, 8, use_extended
+            )
+        finally:
+            writer.close()
+    except Exception as e:
+        success, weights, error = False, [], f"Serial error: {e}"
+
+    elapsed = time.time() - start_time
+
+    if success:
+        valid_count = sum(1 for _, _, _, v in weights if v)
+        print(f"[{label}] Success! {valid_count}/8 valid sensors in {elapsed:.3f}s")
+    else:
+        print(f"[{label}] Failed: {error}")
+
+    return {
+        'port': port,
+        'mux_id': mux_id,
+        'label': label,
+        'success': success,
+        'weights': weights,
+        'error': error,
+        'elapsed': elapsed
+    }
+
+
+async def read_muxes_async(mux_configs, baudrate):
+    """Read every (port, mux_id, use_extended, label) config on one event loop."""
+    return await asyncio.gather(*(
+        read_mux_async(port, mux_id, baudrate, use_extended, label)
+        for port, mux_id, use_extended, label in mux_configs
+    ))
+
+
 def read_mux_thread(port, mux_id, baudrate, use_extended, results, index, label):
     """Thread function for parallel reading."""
     print(f"[{label}] Reading from {port}...")
@@ -131,31 +195,34 @@ def read_mux_thread(port, mux_id, baudrate, use_extended, results, index, label)
 
 
 def print_results(result):
-    """Print formatted results."""
+    """Print formatted results for one MUX in a single stdout write."""
     label = result['label']
     port = result['port']
     mux_id = result['mux_id']
     weights = result['weights']
 
-    print(f"\n{'=' * 80}")
-    print(f"{label}: {mux_id} (Port: {port})")
-    print(f"{'=' * 80}")
-    print(f"{'Ch':<5} {'Weight (kg)':<15} {'Status':<20} {'Valid':<5}")
-    print(f"{'-' * 80}")
+    lines = [
+        f"\n{'=' * 80}",
+        f"{label}: {mux_id} (Port: {port})",
+        f"{'=' * 80}",
+        f"{'Ch':<5} {'Weight (kg)':<15} {'Status':<20} {'Valid':<5}",
+        f"{'-' * 80}",
+    ]
 
     total_weight = 0.0
     valid_count = 0
 
     for ch, weight, status, valid in weights:
         icon = "✓" if valid else "✗"
-        print(f"{ch:<5} {weight:<15.3f} {status:<20} {icon:<5}")
+        lines.append(f"{ch:<5} {weight:<15.3f} {status:<20} {icon:<5}")
         if valid:
             total_weight += weight
             valid_count += 1
 
-    print(f"{'-' * 80}")
-    print(f"Valid: {valid_count}/8  |  Total weight: {total_weight:.3f} kg  |  Time: {result['elapsed']:.3f}s")
-    print(f"{'=' * 80}")
+    lines.append(f"{'-' * 80}")
+    lines.append(f"Valid: {valid_count}/8  |  Total weight: {total_weight:.3f} kg  |  Time: {result['elapsed']:.3f}s")
+    lines.append(f"{'=' * 80}")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
     return total_weight, valid_count
 
@@ -193,19 +260,30 @@ def main():
     print(f"Command: 'gd' (9-digit precision)")
     print(f"{'=' * 80}\n")
 
-    # Read in parallel
-    results = [None, None]
+    # Read in parallel: one event loop when pyserial-asyncio is available,
+    # one thread per port otherwise (and on Windows, where serial asyncio
+    # support is less mature)
+    if serial_asyncio is not None and sys.platform != 'win32':
+        print("Reading both MUXes in parallel (asyncio)...\n")
+        start = time.time()
+
+        results = asyncio.run(read_muxes_async([
+            (port1, mux1_id, use_ext1, "MUX 1"),
+            (port2, mux2_id, use_ext2, "MUX 2"),
+        ], baudrate))
+    else:
+        results = [None, None]
 
-    t1 = threading.Thread(target=read_mux_thread, args=(port1, mux1_id, baudrate, use_ext1, results, 0, "MUX 1"))
-    t2 = threading.Thread(target=read_mux_thread, args=(port2, mux2_id, baudrate, use_ext2, results, 1, "MUX 2"))
+        t1 = threading.Thread(target=read_mux_thread, args=(port1, mux1_id, baudrate, use_ext1, results, 0, "MUX 1"))
+        t2 = threading.Thread(target=read_mux_thread, args=(port2, mux2_id, baudrate, use_ext2, results, 1, "MUX 2"))
 
-    print("Reading both MUXes in parallel...\n")
-    start = time.time()
+        print("Reading both MUXes in parallel...\n")
+        start = time.time()
 
-    t1.start()
-    t2.start()
-    t1.join()
-    t2.join()
+        t1.start()
+        t2.start()
+        t1.join()
+        t2.join()
 
     total_time = time.time() - start
     print(f"\nCompleted in {total_time:.3f}s\n")
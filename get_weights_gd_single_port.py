@@ -19,48 +19,13 @@ All MUXes share the same serial port but have unique IDs.
 """
 
 import serial
+import sys
 import time
 from typing import List, Tuple
 
-
-def XOR_CRC_calculation(msg):
-    """Calculate XOR checksum per PDF Page 12."""
-    checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
-        checksum ^= byte
-    return str(hex(checksum)[2:]).upper().zfill(2)
-
-
-def create_lowa_msg(head, uid, command, data):
-    """Build LOWA protocol message per PDF Page 12."""
-    c_length = str(len(head + "00" + command + uid + data))
-    msg = head + c_length.zfill(2) + command + uid + data
-    msg_crc = XOR_CRC_calculation(msg)
-    msg += msg_crc
-    return msg + "\r"
-
-
-def parse_gd_response(response, channel_idx):
-    """Parse 'gd' response: @|14|swwwwwwwwwx|CC|CR"""
-    try:
-        data = response[3:]  # Skip prefix and length
-        sign = data[0]
-        weight_str = data[1:10].strip()  # 9 chars
-        status_char = data[10]
-
-        weight = float(weight_str)
-        if sign == '-':
-            weight = -weight
-
-        status_map = {' ': 'OK', 'M': 'MOTION', 'C': 'NOT_CONNECTED', 'E': 'EEPROM_ERROR'}
-        status = status_map.get(status_char, 'UNKNOWN')
-        valid = (status_char == ' ')
-
-        return (channel_idx, weight, status, valid)
-    except Exception as e:
-        return (channel_idx, 0.0, f"PARSE_ERROR({e})", False)
+from lowa_protocol import (
+    adaptive_timeout, gd_frames, parse_gd, record_response, record_timeout, rtt_state
+)
 
 
 def read_all_weights_gd_single_port(ser, mux_id, num_channels=8, use_extended=True, inter_command_delay=0.05):
@@ -74,11 +39,16 @@ def read_all_weights_gd_single_port(ser, mux_id, num_channels=8, use_extended=Tr
         use_extended: Use extended addressing
         inter_command_delay: Delay between commands (seconds)
 
+    The per-channel read timeout adapts to the MUX's observed response
+    time, with the port's configured timeout as the upper bound.
+
     Returns:
         Tuple of (success, weights_list, error_message)
         weights_list: List of tuples (channel, weight, status, valid)
     """
     weights = []
+    max_timeout = ser.timeout
+    rtt = rtt_state(ser.port, mux_id, max_timeout)
 
     try:
         # Flush buffers before starting
@@ -87,22 +57,24 @@ def read_all_weights_gd_single_port(ser, mux_id, num_channels=8, use_extended=Tr
 
         head = '#' if use_extended else '@'
 
-        for channel in range(num_channels):
+        for channel, frame in enumerate(gd_frames(head, mux_id, num_channels)):
             try:
-                # Build command: gd + channel + mode(0=weight)
-                msg = create_lowa_msg(head, mux_id, "gd", str(channel) + "0")
-
-                # Send command
-                ser.write(str.encode(msg))
-                ser.flush()
+                # Send command: gd + channel + mode(0=weight)
+                ser.timeout = adaptive_timeout(rtt, max_timeout)
+                # Drop any late reply to the previous channel
+                ser.reset_input_buffer()
+                sent = time.monotonic()
+                ser.write(frame)
 
                 # Read response
                 response = ser.read_until(b"\r").decode("utf-8")
 
                 if response and len(response) >= 14:
-                    ch, weight, status, valid = parse_gd_response(response, channel)
+                    record_response(rtt, time.monotonic() - sent)
+                    ch, weight, status, valid = parse_gd(response, channel)
                     weights.append((ch, weight, status, valid))
                 else:
+                    record_timeout(rtt, max_timeout)
                     weights.append((channel, 0.0, "NO_RESPONSE", False))
 
                 # Small delay between commands on shared bus
@@ -117,6 +89,9 @@ def read_all_weights_gd_single_port(ser, mux_id, num_channels=8, use_extended=Tr
     except Exception as e:
         return (False, [], f"Error reading MUX: {e}")
 
+    finally:
+        ser.timeout = max_timeout
+
 
 def read_multiple_muxes_single_port(port, mux_configs, baudrate=9600, timeout=0.5, inter_mux_delay=0.1):
     """
@@ -191,31 +166,34 @@ def read_multiple_muxes_single_port(port, mux_configs, baudrate=9600, timeout=0.
 
 
 def print_results(result):
-    """Print formatted results for one MUX."""
+    """Print formatted results for one MUX in a single stdout write."""
     label = result['label']
     port = result['port']
     mux_id = result['mux_id']
     weights = result['weights']
 
-    print(f"{'=' * 80}")
-    print(f"{label}: {mux_id} (Port: {port})")
-    print(f"{'=' * 80}")
-    print(f"{'Ch':<5} {'Weight (kg)':<15} {'Status':<20} {'Valid':<5}")
-    print(f"{'-' * 80}")
+    lines = [
+        f"{'=' * 80}",
+        f"{label}: {mux_id} (Port: {port})",
+        f"{'=' * 80}",
+        f"{'Ch':<5} {'Weight (kg)':<15} {'Status':<20} {'Valid':<5}",
+        f"{'-' * 80}",
+    ]
 
     total_weight = 0.0
     valid_count = 0
 
     for ch, weight, status, valid in weights:
         icon = "✓" if valid else "✗"
-        print(f"{ch:<5} {weight:<15.3f} {status:<20} {icon:<5}")
+        lines.append(f"{ch:<5} {weight:<15.3f} {status:<20} {icon:<5}")
         if valid:
             total_weight += weight
             valid_count += 1
 
-    print(f"{'-' * 80}")
-    print(f"Valid: {valid_count}/8  |  Total weight: {total_weight:.3f} kg  |  Time: {result['elapsed']:.3f}s")
-    print(f"{'=' * 80}\n")
+    lines.append(f"{'-' * 80}")
+    lines.append(f"Valid: {valid_count}/8  |  Total weight: {total_weight:.3f} kg  |  Time: {result['elapsed']:.3f}s")
+    lines.append(f"{'=' * 80}\n")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
     return total_weight, valid_count
 
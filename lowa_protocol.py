@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+LOWA Protocol Helpers
+=====================
+Shared frame building and response parsing for the LOWA DIGI SENS protocol.
+
+Based on K321e-06_lowa_protocol.pdf Section 4.2-4.3 (Page 12) and
+Section 4.8.1 (Page 22-23).
+
+Frame Format:
+    Standard:  @|LL|cmd|nnn|data|CC|CR
+    Extended:  #|LL|cmd|nnnnnnnnnnnnnnnn|data|CC|CR
+"""
+
+import operator
+from functools import lru_cache, reduce
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, see requirements.txt
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, see requirements.txt
+    njit = None
+
+
+STATUS_MAP = {
+    ' ': 'OK',
+    'M': 'MOTION',
+    'C': 'NOT_CONNECTED',
+    'E': 'EEPROM_ERROR'
+}
+
+
+# Status names indexed by the small status ids used by the parsers
+STATUS_NAMES = ('OK', 'MOTION', 'NOT_CONNECTED', 'EEPROM_ERROR', 'UNKNOWN')
+
+# Status flag byte -> status id (4 = UNKNOWN), and whether the reading is valid
+STATUS_ID = bytearray([4]) * 256
+STATUS_ID[0x20] = 0  # ' '
+STATUS_ID[0x4D] = 1  # 'M'
+STATUS_ID[0x43] = 2  # 'C'
+STATUS_ID[0x45] = 3  # 'E'
+VALID = bytearray(256)
+VALID[0x20] = 1
+
+
+def gl_response_len(num_channels=8):
+    """
+    Length of a 'gl' answer: prefix + length + 11 bytes per channel +
+    checksum + CR. The answer carries no UID, so it is the same for
+    standard and extended addressing.
+    """
+    return 1 + 2 + num_channels * 11 + 2 + 1
+
+
+GL_RESPONSE_LEN = gl_response_len()
+
+# Rate used with --fast-baud, and the rates tried when a MUX does not answer
+FAST_BAUDRATE = 115200
+PROBE_BAUDRATES = (115200, 57600, 38400, 19200, 9600)
+
+# A read returns once the line has been idle this long after the last byte
+INTER_BYTE_TIMEOUT = 0.005
+
+if njit is not None:
+    @njit(cache=True)
+    def _xor_crc_nb(buf):
+        checksum = 0
+        for byte in buf:
+            checksum ^= byte
+        return checksum
+
+    @njit(cache=True)
+    def _parse_weights_nb(buf):
+        """Parse n 11-byte weight blocks into (weights, status ids)."""
+        n = buf.shape[0] // 11
+        weights = np.zeros(n, dtype=np.float64)
+        status_ids = np.empty(n, dtype=np.uint8)
+        for i in range(n):
+            base = i * 11
+            value = 0.0
+            scale = 0.0  # 0 until the decimal point is seen
+            digits = 0
+            ok = True
+            started = False
+            ended = False  # Padding after the number, like float() strips
+            for j in range(base + 1, base + 9):
+                c = buf[j]
+                if c == 32:  # ' '
+                    if started:
+                        ended = True
+                    continue
+                if ended:
+                    ok = False
+                    break
+                started = True
+                if c == 46:  # '.'
+                    if scale != 0.0:
+                        ok = False
+                        break
+                    scale = 1.0
+                elif 48 <= c <= 57:  # '0'-'9'
+                    value = value * 10.0 + (c - 48)
+                    digits += 1
+                    if scale != 0.0:
+                        scale *= 10.0
+                else:
+                    ok = False
+                    break
+
+            if not ok or digits == 0:
+                status_ids[i] = 3  # Unparsable weight, same as float() failing
+                continue
+
+            if scale != 0.0:
+                value /= scale
+            if buf[base] == 45:  # '-'
+                value = -value
+            weights[i] = value
+
+            status = buf[base + 9]
+            if status == 32:
+                status_ids[i] = 0
+            elif status == 77:  # 'M'
+                status_ids[i] = 1
+            elif status == 67:  # 'C'
+                status_ids[i] = 2
+            elif status == 69:  # 'E'
+                status_ids[i] = 3
+            else:
+                status_ids[i] = 4
+        return weights, status_ids
+else:
+    _xor_crc_nb = None
+    _parse_weights_nb = None
+
+
+def _parse_weights_np(buf):
+    """
+    Vectorized NumPy counterpart of _parse_weights_nb.
+
+    The payload is viewed as an (n, 11) array of bytes, and the weight
+    digits are combined with precomputed place values instead of calling
+    float() once per channel.
+    """
+    arr = buf.reshape(-1, 11)
+    field = arr[:, 1:9]
+
+    is_digit = (field >= 48) & (field <= 57)  # '0'-'9'
+    is_dot = field == 46                      # '.'
+    is_text = field != 32                     # not ' ' padding
+
+    # Padding is only allowed around the number, like float() strips it
+    first = np.argmax(is_text, axis=1)
+    last = field.shape[1] - 1 - np.argmax(is_text[:, ::-1], axis=1)
+    ok = (
+        np.all(is_digit | is_dot | ~is_text, axis=1)
+        & (is_text.sum(axis=1) == last - first + 1)
+        & (is_dot.sum(axis=1) <= 1)
+        & is_digit.any(axis=1)
+    )
+
+    # Place value of each digit = number of digits to its right
+    digits_right = np.cumsum(is_digit[:, ::-1], axis=1)[:, ::-1] - is_digit
+    mantissa = np.sum(np.where(is_digit, field - 48, 0) * 10.0 ** digits_right, axis=1)
+
+    # Digits after the decimal point scale the mantissa down
+    after_dot = np.cumsum(is_dot, axis=1) > 0
+    frac_digits = np.sum(is_digit & after_dot, axis=1)
+    weights = mantissa / 10.0 ** frac_digits
+    weights = np.where(arr[:, 0] == 45, -weights, weights)  # '-'
+
+    status_ids = np.where(ok, _STATUS_ID_LUT[arr[:, 9]], 3).astype(np.uint8)
+    weights = np.where(ok, weights, 0.0)
+    return weights, status_ids
+
+
+if np is not None:
+    # STATUS_ID as an array for vectorized lookups
+    _STATUS_ID_LUT = np.frombuffer(bytes(STATUS_ID), dtype=np.uint8)
+
+
+# Below this size a NumPy/numba call costs more than the reduce() fold
+NUMPY_MIN_LEN = 64
+
+
+def xor_crc(msg):
+    """
+    Calculate XOR checksum per PDF Page 12, Section 4.3.
+
+    "The checksum is a XOR on all previous bytes (including "@") modulo 0xFF,
+    in Hexadecimal ASCII."
+
+    Long messages (e.g. full 'gl' responses) are folded by a numba-compiled
+    loop, or with np.bitwise_xor.reduce when only NumPy is installed.
+
+    Args:
+        msg: Message string (or bytes) without checksum
+
+    Returns:
+        Hexadecimal checksum string (2 chars, uppercase, zero-padded)
+    """
+    buf = msg.encode('ascii') if isinstance(msg, str) else msg
+    if _xor_crc_nb is not None and len(buf) >= NUMPY_MIN_LEN:
+        checksum = _xor_crc_nb(np.frombuffer(buf, dtype=np.uint8))
+    elif np is not None and len(buf) >= NUMPY_MIN_LEN:
+        checksum = int(np.bitwise_xor.reduce(np.frombuffer(buf, dtype=np.uint8)))
+    else:
+        checksum = reduce(operator.xor, buf, 0)
+    return f"{checksum:02X}"
+
+
+def verify_crc(response):
+    """
+    Check the checksum of a raw MUX response.
+
+    Args:
+        response: Raw response bytes ending with {checksum}{CR}
+
+    Returns:
+        True if the checksum matches the preceding bytes
+    """
+    buf = memoryview(response)
+    return xor_crc(buf[:-3]) == bytes(buf[-3:-1]).decode('ascii', errors='replace').upper()
+
+
+@lru_cache(maxsize=None)
+def _frame_prefix(head, uid, command, data_len):
+    """
+    Return the constant 'head + length + command + uid' part of a frame.
+
+    The length field only depends on the size of the data, so for a fixed
+    MUX and command (e.g. 'gd' over all channels) it is computed once.
+    """
+    total = len(head + "00" + command + uid) + data_len
+    return head + f"{total:02d}" + command + uid
+
+
+def build_frame(head, uid, command, data):
+    """
+    Build a complete LOWA protocol message per PDF Page 12, Section 4.2.
+
+    Verified against PDF examples:
+    - @09sz123040 (Page 12)
+    - @08gl12373 (Page 14)
+
+    Args:
+        head: Message prefix ('#' for extended, '@' for standard)
+        uid: MUX unique identifier
+        command: Command code (e.g., 'gl', 'gd', 'sz')
+        data: Additional data (e.g., channel number)
+
+    Returns:
+        Complete message string with checksum and CR
+    """
+    msg = _frame_prefix(head, uid, command, len(data)) + data
+    return msg + xor_crc(msg) + "\r"
+
+
+@lru_cache(maxsize=128)
+def encoded_frame(head, uid, command, data):
+    """
+    Return build_frame() encoded to bytes, built once per distinct command.
+
+    Polling sends the same 'gl' request every time, so after the first call
+    the send path does no string building, checksum or encoding at all.
+    """
+    return build_frame(head, uid, command, data).encode('ascii')
+
+
+@lru_cache(maxsize=None)
+def gd_frames(head, uid, num_channels=8):
+    """
+    Return the encoded 'gd' weight requests (k=0) for every channel of a MUX.
+
+    The frames only differ in the channel digit, so they are built once per
+    MUX and the polling loop just writes the cached bytes.
+
+    Args:
+        head: Message prefix ('#' for extended, '@' for standard)
+        uid: MUX unique identifier
+        num_channels: Number of channels (default: 8)
+
+    Returns:
+        Tuple of frames as bytes, indexed by channel
+    """
+    return tuple(
+        build_frame(head, uid, "gd", str(channel) + "0").encode('ascii')
+        for channel in range(num_channels)
+    )
+
+
+def parse_gd(response, channel_idx):
+    """
+    Parse 'gd' command response per PDF Page 22-23, Section 4.8.1.
+
+    Response format: @|14|swwwwwwwwwx|CC|CR
+    - Position 0: @ or #
+    - Position 1-2: Length (14)
+    - Position 3: Sign (space or -)
+    - Position 4-12: Weight (9 chars with decimal)
+    - Position 13: Status flag
+
+    Args:
+        response: Full response string (e.g., "@14 14000.000 6E")
+        channel_idx: Channel number
+
+    Returns:
+        Tuple of (channel, weight, status, valid)
+    """
+    try:
+        data = response[3:]  # Skip prefix and length
+        sign = data[0]
+        weight_str = data[1:10].strip()  # 9 chars
+        status_char = data[10]
+
+        weight = float(weight_str)
+        if sign == '-':
+            weight = -weight
+
+        status = STATUS_MAP.get(status_char, 'UNKNOWN')
+        valid = (status_char == ' ')
+
+        return (channel_idx, weight, status, valid)
+    except Exception as e:
+        return (channel_idx, 0.0, f"PARSE_ERROR({e})", False)
+
+
+def parse_weight_response(response, channel_idx):
+    """
+    Parse a single weight value from the response.
+
+    Args:
+        response: 11-byte weight block (bytes or memoryview)
+        channel_idx: Channel number for display
+
+    Returns:
+        Tuple of (channel, weight, status, valid)
+    """
+    # Format: {sign}{8-char-weight}{status}
+    # Example: b" 0002.130 " or b"-0001.250M"
+    sign = response[0]
+    status_byte = response[9]
+
+    # Parse weight (float() accepts ASCII bytes and ignores the padding)
+    try:
+        weight = float(response[1:9])
+        if sign == 0x2D:  # '-'
+            weight = -weight
+    except ValueError:
+        weight = 0.0
+        status_byte = 0x45  # 'E'
+
+    # Parse status (table lookups, no branching on the flag)
+    status = STATUS_NAMES[STATUS_ID[status_byte]]
+    valid = bool(VALID[status_byte])
+
+    return (channel_idx, weight, status, valid)
+
+
+def parse_all_weights(data):
+    """
+    Parse every complete weight block of a 'gl' payload.
+
+    Uses the numba-compiled parser when numba is installed, or the
+    vectorized NumPy parser when only NumPy is.
+
+    Args:
+        data: Response payload bytes without prefix, length, checksum and CR
+
+    Returns:
+        List of tuples: (channel, weight, status, valid)
+    """
+    # Each weight is 11 bytes
+    if np is not None:
+        count = len(data) // 11
+        buf = np.frombuffer(data, dtype=np.uint8, count=count * 11)
+        parse = _parse_weights_nb if _parse_weights_nb is not None else _parse_weights_np
+        values, status_ids = parse(buf)
+        return [
+            (channel_idx, float(values[channel_idx]), STATUS_NAMES[status_ids[channel_idx]],
+             bool(status_ids[channel_idx] == 0))
+            for channel_idx in range(count)
+        ]
+
+    weights = []
+    for i in range(0, len(data), 11):
+        weight_block = data[i:i+11]
+        if len(weight_block) == 11:
+            channel_idx = i // 11
+            parsed = parse_weight_response(weight_block, channel_idx)
+            weights.append(parsed)
+    return weights
+
+
+def read_gl_response(ser, expected_len=GL_RESPONSE_LEN):
+    """
+    Read one 'gl' answer of known length.
+
+    A single read(expected_len) avoids scanning for the terminator byte by
+    byte. If the answer does not end in a CR (more channels than expected,
+    or the read was cut short by the inter-byte timeout, e.g. on a USB
+    converter that delivers data in chunks), the rest is read up to the CR.
+
+    Args:
+        ser: Open serial connection object
+        expected_len: Expected answer length in bytes
+
+    Returns:
+        Raw response bytes (empty on timeout)
+    """
+    raw_answer = ser.read(expected_len)
+    if raw_answer and raw_answer[-1:] != b"\r":
+        raw_answer += ser.read_until(b"\r")
+    return raw_answer
+
+
+# Smoothed 'gd' response times per (port, mux_id), see adaptive_timeout()
+_rtt_states = {}
+
+MIN_TIMEOUT = 0.05
+
+
+def rtt_state(port, mux_id, max_timeout=0.5):
+    """
+    Return the response-time state for one MUX on one port.
+
+    The average starts at max_timeout / 4 so the first reads use the full
+    timeout until real response times have been observed.
+    """
+    return _rtt_states.setdefault((port, mux_id), {'ewma': max_timeout / 4})
+
+
+def adaptive_timeout(state, max_timeout=0.5):
+    """Read timeout for the next request: 4x the smoothed response time, clamped."""
+    return max(MIN_TIMEOUT, min(max_timeout, 4 * state['ewma']))
+
+
+def record_response(state, elapsed):
+    """Fold the response time of a successful read into the average."""
+    state['ewma'] = 0.9 * state['ewma'] + 0.1 * elapsed
+
+
+def record_timeout(state, max_timeout=0.5):
+    """
+    Back off after a timed-out read.
+
+    Timeouts do not count as response times, but the average is doubled
+    (up to max_timeout / 4) so a MUX that got slower is not starved by a
+    timeout shorter than its real response time.
+    """
+    state['ewma'] = min(max_timeout / 4, 2 * state['ewma'])
+
+
+def discard_input(reader, writer):
+    """
+    Drop unread input on a serial_asyncio stream pair before a request.
+
+    A late or partial answer would otherwise be read as the reply to the
+    next request. Clears both the port's input buffer and the bytes the
+    StreamReader has already pulled from it.
+    """
+    writer.transport.serial.reset_input_buffer()
+    # StreamReader has no public way to drop its buffered bytes, so this is
+    # the one place that touches its private bytearray (checked against
+    # asyncio in Python 3.11 with pyserial 3.5 and pyserial-asyncio 0.6)
+    reader._buffer.clear()
@@ -18,7 +18,7 @@ def XOR_CRC_calculation(msg):
     checksum = 0
     for b in msg.encode():
         checksum ^= b
-    return str(hex(checksum)[2:]).upper()
+    return format(checksum, '02X')
 
 
 # ------------------------------
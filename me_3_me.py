@@ -1,21 +1,6 @@
 import serial
-def create_lowa_msg(head, uid, command, data):
-    # Calculate length
-    c_length = str(len(head + "00" + command + uid + data))
-    msg = head + c_length.zfill(2) + command + uid + data
-    # Calculate XOR-CRC
-    msg_crc = XOR_CRC_calculation(msg)
-    # Add the CRC
-    msg += msg_crc
-    return msg + "\r"
- 
-def XOR_CRC_calculation(msg):
-    checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
-        checksum ^= byte
-    return str(hex(checksum)[2:]).upper()
+
+from lowa_protocol import build_frame
 
 ser = serial.Serial()
 ser.baudrate = 9600
@@ -35,8 +20,8 @@ ser.open()
 uid = '0120250925110711'
 # print(f"{uid=}")                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                      }")
 
-msg = create_lowa_msg("#", uid, "gd", f"{0}" + f"{0}")
-# msg = create_lowa_msg("#", uid, "gl", "")
+msg = build_frame("#", uid, "gd", f"{0}" + f"{0}")
+# msg = build_frame("#", uid, "gl", "")
 
 print(msg)
 
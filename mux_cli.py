@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Command Line Helpers for the Two-MUX Scripts
+============================================
+Options, --config handling and prompts shared by read_two_muxes_simple.py
+and read_two_muxes_multiport.py.
+"""
+
+import argparse
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional, only needed for --config
+    yaml = None
+
+from lowa_protocol import FAST_BAUDRATE
+
+
+def mux_arg_parser(description):
+    """
+    Return an ArgumentParser with the options shared by the two-MUX scripts.
+
+    The caller adds its port options and parses with parse_mux_args().
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--config', metavar='FILE',
+        help="YAML file with any of the options below, e.g. 'mux1_id: \"123\"'")
+    parser.add_argument('--mux1-id', help="MUX 1 ID (3-digit or 16-char)")
+    parser.add_argument('--mux2-id', help="MUX 2 ID (3-digit or 16-char)")
+    parser.add_argument(
+        '--baudrate', type=int,
+        help=f"communication speed (default: 9600, {FAST_BAUDRATE} with --fast-baud)")
+    parser.add_argument(
+        '--fast-baud', action='store_true',
+        help=f"default to {FAST_BAUDRATE} baud and probe slower rates "
+             f"if a MUX does not answer")
+    parser.add_argument(
+        '--interactive', action='store_true',
+        help="prompt for the settings (also the default when no MUX ID is given)")
+    parser.add_argument(
+        '--repeat', type=int, default=1, metavar='N',
+        help="read both MUXes N times back-to-back and report cycle times")
+    return parser
+
+
+def parse_mux_args(parser, argv=None):
+    """
+    Parse command line options with a parser from mux_arg_parser().
+
+    Values from a --config YAML file become the defaults, so options given
+    on the command line still override them.
+    """
+    args = parser.parse_args(argv)
+    if args.config:
+        if yaml is None:
+            parser.error("--config needs PyYAML (pip install pyyaml)")
+        with open(args.config) as f:
+            config = yaml.safe_load(f) or {}
+        parser.set_defaults(**{key.replace('-', '_'): value for key, value in config.items()})
+        args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    # IDs from YAML may come back as numbers
+    for key in ('mux1_id', 'mux2_id'):
+        if getattr(args, key) is not None:
+            setattr(args, key, str(getattr(args, key)))
+
+    return args
+
+
+def ask(prompt, default=None):
+    """input() with the default shown in brackets and used for empty answers."""
+    suffix = f" [{default}]" if default else ""
+    return input(f"{prompt}{suffix}: ").strip() or default
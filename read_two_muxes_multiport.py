@@ -13,197 +13,500 @@ Architecture:
 
 Usage:
     python read_two_muxes_multiport.py
+    python read_two_muxes_multiport.py --mux1-id 123 --mux2-id 124 --repeat 100
 
 Reference: qna.txt line 65 - "multiple converters which correspond to multiple RS485 buses"
 """
 
+import asyncio
+import os
+import selectors
 import serial
-import threading
+import sys
 import time
 from typing import List, Tuple, Optional
 
+try:
+    import serial_asyncio
+except ImportError:  # pyserial-asyncio is optional, reads are pipelined instead
+    serial_asyncio = None
 
-def XOR_CRC_calculation(msg):
+from lowa_protocol import (
+    FAST_BAUDRATE, INTER_BYTE_TIMEOUT, PROBE_BAUDRATES, discard_input, encoded_frame,
+    parse_all_weights, read_gl_response, verify_crc
+)
+from mux_cli import ask, mux_arg_parser, parse_mux_args
+
+
+def parse_mux_answer(raw_answer):
     """
-    Calculate XOR checksum for LOWA protocol.
+    Validate and parse a raw 'gl' response.
 
     Args:
-        msg: Message string without checksum
+        raw_answer: Response bytes as read from the port
 
     Returns:
-        Hexadecimal checksum string (2 chars, uppercase)
+        Tuple of (success, weights_list, error_message)
     """
-    checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
-        checksum ^= byte
-    return str(hex(checksum)[2:]).upper().zfill(2)
+    if not raw_answer or len(raw_answer) < 5:
+        return (False, [], "No response or timeout")
+
+    if not verify_crc(raw_answer):
+        return (False, [], "Checksum mismatch in response")
+
+    # Parse response
+    # Response format: #LL{weight0}{weight1}...{weight7}{checksum}\r
+    # Skip prefix (1 char) and length (2 chars) = 3 chars
+    # Remove checksum (2 chars) and CR (1 char) from end = -3 chars
+    data = memoryview(raw_answer)[3:-3]
+
+    return (True, parse_all_weights(data), None)
 
 
-def create_lowa_msg(head, uid, command, data):
+def send_request(ser, mux_id, use_extended=True):
     """
-    Build a complete LOWA protocol message with checksum.
+    Send a 'gl' (get all weights) request without waiting for the answer.
 
     Args:
-        head: Message prefix ('#' for extended, '@' for standard)
-        uid: MUX unique identifier
-        command: Command code (e.g., 'gl', 'gw', 'sz')
-        data: Additional data (e.g., channel number)
-
-    Returns:
-        Complete message string with checksum and CR
+        ser: Open serial connection object
+        mux_id: MUX identifier (3-digit or 16-char)
+        use_extended: Use extended addressing mode (default: True)
     """
-    # Calculate length (command + uid + data + 2 for checksum)
-    c_length = str(len(head + "00" + command + uid + data))
-    msg = head + c_length.zfill(2) + command + uid + data
+    # Drop a late answer to the previous request so it is not read as this one
+    ser.reset_input_buffer()
+
+    # Send command to get all weights (encoded once, then cached)
+    head = '#' if use_extended else '@'
+    ser.write(encoded_frame(head, mux_id, "gl", ""))
 
-    # Calculate and add XOR-CRC
-    msg_crc = XOR_CRC_calculation(msg)
-    msg += msg_crc
 
-    return msg + "\r"
+def recv_responses(sers, timeout=0.5):
+    """
+    Wait for one CR-terminated response on every port from a single thread.
 
+    The ports' file descriptors are multiplexed with selectors, so each
+    response is collected as soon as its bytes arrive, whichever port
+    answers first. On Windows the ports are read one after another.
 
-def parse_weight_response(response, channel_idx):
+    Args:
+        sers: Open serial connection objects
+        timeout: Overall deadline in seconds
+
+    Returns:
+        Dict mapping each serial object to (raw_answer, finished_at, error),
+        where raw_answer is empty on timeout, finished_at is a time.time()
+        value and error is None unless reading the port failed
     """
-    Parse a single weight value from the response.
+    if sys.platform == 'win32':
+        answers = {}
+        for ser in sers:
+            try:
+                answers[ser] = (read_gl_response(ser), time.time(), None)
+            except Exception as e:
+                answers[ser] = (b"", time.time(), f"Serial error: {e}")
+        return answers
+
+    buffers = {ser.fileno(): bytearray() for ser in sers}
+    finished = {}
+    errors = {}
+
+    sel = selectors.DefaultSelector()
+    for ser in sers:
+        sel.register(ser.fileno(), selectors.EVENT_READ, data=ser)
+
+    deadline = time.monotonic() + timeout
+    try:
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                try:
+                    chunk = os.read(key.fd, 256)
+                except OSError as e:
+                    errors[key.fd] = f"Serial error: {e}"
+                    finished[key.fd] = time.time()
+                    sel.unregister(key.fd)
+                    continue
+                buf = buffers[key.fd]
+                buf += chunk
+                if b"\r" in buf or not chunk:
+                    finished[key.fd] = time.time()
+                    sel.unregister(key.fd)
+    finally:
+        sel.close()
+
+    now = time.time()
+    answers = {}
+    for ser in sers:
+        buf = buffers[ser.fileno()]
+        end = buf.find(b"\r")
+        answers[ser] = (bytes(buf if end < 0 else buf[:end + 1]),
+                        finished.get(ser.fileno(), now), errors.get(ser.fileno()))
+    return answers
+
+
+def open_port(port, baudrate=9600, timeout=0.5):
+    """
+    Open a serial port that stays open for repeated reads.
 
     Args:
-        response: 11-character weight block
-        channel_idx: Channel number for display
+        port: Serial port (e.g., '/dev/ttyUSB0')
+        baudrate: Communication speed (default: 9600)
+        timeout: Read timeout in seconds (default: 0.5)
 
     Returns:
-        Tuple of (channel, weight, status, valid)
+        Open serial connection object (the caller closes it)
     """
-    # Format: {sign}{8-char-weight}{status}
-    # Example: " 0002.130 " or "-0001.250M"
-    sign = response[0]
-    weight_str = response[1:9].strip()
-    status_char = response[9]
+    ser = serial.Serial()
+    ser.baudrate = baudrate
+    ser.timeout = timeout
+    ser.inter_byte_timeout = INTER_BYTE_TIMEOUT
+    ser.port = port
+    ser.open()
+    return ser
 
-    # Parse weight
-    try:
-        weight = float(weight_str)
-        if sign == '-':
-            weight = -weight
-    except ValueError:
-        weight = 0.0
-        status_char = 'E'
-
-    # Parse status
-    status_map = {
-        ' ': 'OK',
-        'M': 'MOTION',
-        'C': 'NOT_CONNECTED',
-        'E': 'EEPROM_ERROR'
-    }
-    status = status_map.get(status_char, 'UNKNOWN')
-    valid = (status_char == ' ')
-
-    return (channel_idx, weight, status, valid)
-
-
-def read_mux_weights(port, mux_id, baudrate=9600, use_extended=True, timeout=0.5):
+
+def probe_baudrate(port, mux_id, use_extended=True, baudrates=PROBE_BAUDRATES, timeout=0.15):
     """
-    Read all weights from a single MUX on a specific serial port.
+    Find the baudrate a MUX answers at (see test_baudrates.py).
+
+    Unlike the 'ag' broadcast there, the MUX is addressed by its ID, so
+    this also works with several MUXes on the bus.
 
     Args:
         port: Serial port (e.g., '/dev/ttyUSB0')
         mux_id: MUX identifier (3-digit or 16-char)
-        baudrate: Communication speed (default: 9600)
         use_extended: Use extended addressing mode (default: True)
-        timeout: Read timeout in seconds (default: 0.5)
+        baudrates: Rates to try, in order
+        timeout: Read timeout per rate in seconds
 
     Returns:
-        Tuple of (success, weights_list, error_message)
-        weights_list: List of tuples (channel, weight, status, valid)
+        First baudrate with a valid answer, or None
     """
-    try:
-        # Open serial connection
-        ser = serial.Serial()
-        ser.baudrate = baudrate
-        ser.timeout = timeout
-        ser.port = port
-        ser.open()
+    for baudrate in baudrates:
+        try:
+            ser = open_port(port, baudrate, timeout)
+        except serial.SerialException:
+            return None
+        try:
+            send_request(ser, mux_id, use_extended)
+            success, _, _ = parse_mux_answer(read_gl_response(ser))
+        finally:
+            ser.close()
+        if success:
+            return baudrate
+    return None
+
+
+def reread_at_probed_baudrate(config, result):
+    """
+    Re-read a MUX that did not answer, at the first baudrate it answers to.
+
+    Args:
+        config: (port, mux_id, use_extended, label) tuple
+        result: Result dictionary of the failed read
+
+    Returns:
+        New result dictionary, or result unchanged if the read succeeded,
+        the port could not be opened, or no baudrate works
+    """
+    port, mux_id, use_extended, label = config
+    if result['success'] or result['error'].startswith("Serial error"):
+        return result
+
+    print(f"[{label}] No valid answer, probing baudrates on {port}...")
+    baudrate = probe_baudrate(port, mux_id, use_extended)
+    if baudrate is None:
+        print(f"[{label}] No answer at any of {PROBE_BAUDRATES}")
+        return result
+
+    print(f"[{label}] MUX answers at {baudrate} baud")
+    result = read_muxes_pipelined([config], baudrate)[0]
+    result['baudrate'] = baudrate
+    return result
+
+
+def per_config_baudrates(baudrate, mux_configs):
+    """
+    Return one baudrate per config.
+
+    Args:
+        baudrate: A single rate for every port, or a sequence with one
+            rate per config (e.g. after probing each MUX separately)
+        mux_configs: List of (port, mux_id, use_extended, label) tuples
+
+    Returns:
+        List of baudrates, in the order of mux_configs
+    """
+    if isinstance(baudrate, int):
+        return [baudrate] * len(mux_configs)
+    return list(baudrate)
 
-        # Build command to get all weights
-        head = '#' if use_extended else '@'
-        msg = create_lowa_msg(head, mux_id, "gl", "")
 
-        # Send command
-        ser.write(str.encode(msg))
+def open_ports(mux_configs, baudrate, timeout=0.5):
+    """
+    Open the port of every (port, mux_id, use_extended, label) config.
 
-        # Read response
-        mux_answer = ser.read_until(b"\r").decode("utf-8")
+    Args:
+        mux_configs: List of (port, mux_id, use_extended, label) tuples
+        baudrate: Communication speed, or one rate per config
+        timeout: Read timeout in seconds
 
-        if not mux_answer or len(mux_answer) < 5:
+    Returns:
+        List of (ser, open_error) tuples, in the order of mux_configs;
+        ser is None if the port could not be opened
+    """
+    ports = []
+    baudrates = per_config_baudrates(baudrate, mux_configs)
+    for (port, mux_id, use_extended, label), rate in zip(mux_configs, baudrates):
+        print(f"[{label}] Reading from {port}...")
+        try:
+            ports.append((open_port(port, rate, timeout), None))
+        except Exception as e:
+            ports.append((None, f"Serial error: {e}"))
+    return ports
+
+
+def close_ports(ports):
+    """Close the ports opened by open_ports()."""
+    for ser, _ in ports:
+        if ser is not None:
             ser.close()
+
+
+def read_open_muxes_pipelined(ports, mux_configs, timeout=0.5):
+    """
+    Read every config once on ports opened by open_ports().
+
+    All requests are written before any response is read, so MUXes on
+    separate buses transmit their answers at the same time, and the
+    responses are collected with recv_responses().
+
+    Returns:
+        List of result dictionaries, in the order of mux_configs
+    """
+    results = []
+    start_time = time.time()
+
+    # A port that fails to open or to write reports its error instead of
+    # aborting the read of the other MUXes
+    port_errors = {}
+    for (ser, open_error), (port, mux_id, use_extended, label) in zip(ports, mux_configs):
+        if ser is None:
+            continue
+        try:
+            send_request(ser, mux_id, use_extended)
+        except Exception as e:
+            port_errors[ser] = f"Serial error: {e}"
+
+    sers = [ser for ser, _ in ports if ser is not None and ser not in port_errors]
+    answers = recv_responses(sers, timeout)
+
+    for (ser, open_error), (port, mux_id, use_extended, label) in zip(ports, mux_configs):
+        if ser is None or ser in port_errors:
+            success, weights, error = (False, [], open_error or port_errors[ser])
+            finished_at = time.time()
+        else:
+            raw_answer, finished_at, read_error = answers[ser]
+            if read_error:
+                success, weights, error = (False, [], read_error)
+            else:
+                # Parsed in-process: handing an answer to a worker process
+                # (pickling it and the result) costs more than parsing it
+                try:
+                    success, weights, error = parse_mux_answer(raw_answer)
+                except Exception as e:
+                    success, weights, error = (False, [], f"Error: {e}")
+
+        elapsed = finished_at - start_time
+
+        if success:
+            print(f"[{label}] Success! Read {len(weights)} sensors in {elapsed:.3f}s")
+        else:
+            print(f"[{label}] Failed: {error}")
+
+        results.append({
+            'port': port,
+            'mux_id': mux_id,
+            'label': label,
+            'success': success,
+            'weights': weights,
+            'error': error,
+            'elapsed': elapsed
+        })
+
+    return results
+
+
+def read_muxes_pipelined(mux_configs, baudrate, timeout=0.5):
+    """
+    Open the ports, read every config once from one thread and close them.
+
+    Args:
+        mux_configs: List of (port, mux_id, use_extended, label) tuples
+        baudrate: Communication speed, or one rate per config
+        timeout: Read timeout in seconds
+
+    Returns:
+        List of result dictionaries, in the order of mux_configs
+    """
+    ports = open_ports(mux_configs, baudrate, timeout)
+    try:
+        return read_open_muxes_pipelined(ports, mux_configs, timeout)
+    finally:
+        close_ports(ports)
+
+
+async def poll_mux_async(reader, writer, request, timeout=0.5):
+    """
+    Send a pre-encoded 'gl' request on an open serial_asyncio connection.
+
+    Returns:
+        Tuple of (success, weights_list, error_message)
+    """
+    try:
+        # Drop a late answer to the previous request so it is not read as this one
+        discard_input(reader, writer)
+        writer.write(request)
+        await writer.drain()
+
+        try:
+            raw_answer = await asyncio.wait_for(reader.readuntil(b"\r"), timeout)
+        except asyncio.TimeoutError:
             return (False, [], "No response or timeout")
+        except asyncio.IncompleteReadError:
+            return (False, [], "Serial error: connection closed")
+
+        return parse_mux_answer(raw_answer)
 
-        # Parse response
-        # Response format: #LL{weight0}{weight1}...{weight7}{checksum}\r
-        # Skip prefix (1 char) and length (2 chars) = 3 chars
-        # Remove checksum (2 chars) and CR (1 char) from end = -3 chars
-        data = mux_answer[3:-3]
-
-        # Each weight is 11 characters
-        weights = []
-        for i in range(0, len(data), 11):
-            weight_block = data[i:i+11]
-            if len(weight_block) == 11:
-                channel_idx = i // 11
-                parsed = parse_weight_response(weight_block, channel_idx)
-                weights.append(parsed)
-
-        ser.close()
-        return (True, weights, None)
-
-    except serial.SerialException as e:
-        return (False, [], f"Serial error: {e}")
     except Exception as e:
         return (False, [], f"Error: {e}")
 
 
-def read_mux_thread(port, mux_id, baudrate, use_extended, results, index, mux_label):
+async def poll_muxes_async(mux_configs, baudrate, cycles=None, interval=0.0,
+                           on_cycle=None, timeout=0.5):
     """
-    Thread function to read MUX weights in parallel.
+    Poll every (port, mux_id, use_extended, label) config repeatedly.
+
+    The connections are opened once and kept for the whole run, so each
+    cycle only writes the cached request bytes, waits for the answers of
+    all MUXes together and parses them.
 
     Args:
-        port: Serial port
-        mux_id: MUX identifier
-        baudrate: Communication speed
-        use_extended: Use extended addressing
-        results: Shared list to store results
-        index: Index in results list
-        mux_label: Label for display
+        mux_configs: List of (port, mux_id, use_extended, label) tuples
+        baudrate: Communication speed, or one rate per config
+        cycles: Number of cycles, or None to poll until cancelled
+        interval: Seconds to wait between cycles
+        on_cycle: Optional callback(results, cycle_time) after every cycle
+        timeout: Read timeout per request in seconds
+
+    Returns:
+        Tuple of (results of the last cycle, list of cycle times)
     """
-    print(f"[{mux_label}] Reading from {port}...")
-    start_time = time.time()
+    connections = []
+    results = []
+    cycle_times = []
+
+    async def poll(connection):
+        start_time = time.time()
+        if isinstance(connection, str):
+            answer = (False, [], connection)  # The port did not open
+        else:
+            answer = await poll_mux_async(*connection, timeout)
+        return answer, time.time() - start_time
 
-    success, weights, error = read_mux_weights(port, mux_id, baudrate, use_extended)
+    try:
+        baudrates = per_config_baudrates(baudrate, mux_configs)
+        for (port, mux_id, use_extended, label), rate in zip(mux_configs, baudrates):
+            try:
+                reader, writer = await serial_asyncio.open_serial_connection(
+                    url=port, baudrate=rate)
+            except Exception as e:
+                connections.append(f"Serial error: {e}")
+                continue
+            head = '#' if use_extended else '@'
+            connections.append((reader, writer, encoded_frame(head, mux_id, "gl", "")))
+
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            if cycle:
+                await asyncio.sleep(interval)
+
+            start_time = time.time()
+            answers = await asyncio.gather(*(poll(c) for c in connections))
+            cycle_time = time.time() - start_time
+            cycle_times.append(cycle_time)
+
+            results = []
+            for (port, mux_id, _, label), (answer, elapsed) in zip(mux_configs, answers):
+                success, weights, error = answer
+                if success:
+                    print(f"[{label}] Success! Read {len(weights)} sensors in {elapsed:.3f}s")
+                else:
+                    print(f"[{label}] Failed: {error}")
+
+                results.append({
+                    'port': port,
+                    'mux_id': mux_id,
+                    'label': label,
+                    'success': success,
+                    'weights': weights,
+                    'error': error,
+                    'elapsed': elapsed
+                })
+
+            if on_cycle is not None:
+                on_cycle(results, cycle_time)
+            cycle += 1
+    finally:
+        for connection in connections:
+            if not isinstance(connection, str):
+                connection[1].close()
+
+    return results, cycle_times
+
+
+def poll_muxes(mux_configs, baudrate, cycles=1, interval=0.0, use_asyncio=True):
+    """
+    Run cycles of reads of every config and time them.
 
-    elapsed = time.time() - start_time
+    The ports stay open for all cycles, with asyncio (poll_muxes_async())
+    or with a pipelined read per cycle (read_open_muxes_pipelined()).
 
-    results[index] = {
-        'port': port,
-        'mux_id': mux_id,
-        'label': mux_label,
-        'success': success,
-        'weights': weights,
-        'error': error,
-        'elapsed': elapsed
-    }
+    Returns:
+        Tuple of (results of the last cycle, list of cycle times)
+    """
+    if use_asyncio:
+        return asyncio.run(poll_muxes_async(mux_configs, baudrate, cycles, interval))
+
+    results = []
+    cycle_times = []
+    ports = open_ports(mux_configs, baudrate)
+    try:
+        for cycle in range(cycles):
+            if cycle:
+                time.sleep(interval)
+            start_time = time.time()
+            results = read_open_muxes_pipelined(ports, mux_configs)
+            cycle_times.append(time.time() - start_time)
+    finally:
+        close_ports(ports)
+
+    return results, cycle_times
 
-    if success:
-        print(f"[{mux_label}] Success! Read {len(weights)} sensors in {elapsed:.3f}s")
-    else:
-        print(f"[{mux_label}] Failed: {error}")
+
+# Table header shared by every print_mux_results() call
+_RESULTS_HEADER = "\n".join([
+    f"{'=' * 70}",
+    f"{'Channel':<10} {'Weight (kg)':<15} {'Status':<15} {'Valid':<10}",
+    f"{'-' * 70}",
+])
 
 
 def print_mux_results(result):
     """
-    Print formatted results for one MUX.
+    Print formatted results for one MUX in a single stdout write.
 
     Args:
         result: Dictionary with MUX reading results
@@ -213,54 +516,124 @@ def print_mux_results(result):
     mux_id = result['mux_id']
     weights = result['weights']
 
-    print(f"\n{'=' * 70}")
-    print(f"{label}: {mux_id} (Port: {port})")
-    print(f"{'=' * 70}")
-    print(f"{'Channel':<10} {'Weight (kg)':<15} {'Status':<15} {'Valid':<10}")
-    print(f"{'-' * 70}")
+    lines = [
+        f"\n{'=' * 70}",
+        f"{label}: {mux_id} (Port: {port})",
+        _RESULTS_HEADER,
+    ]
 
     total_weight = 0.0
     valid_count = 0
 
     for channel, weight, status, valid in weights:
         status_icon = "✓" if valid else "✗"
-        print(f"{channel:<10} {weight:<15.3f} {status:<15} {status_icon:<10}")
+        lines.append(f"{channel:<10} {weight:<15.3f} {status:<15} {status_icon:<10}")
 
         if valid:
             total_weight += weight
             valid_count += 1
 
-    print(f"{'-' * 70}")
-    print(f"Valid sensors: {valid_count}/{len(weights)}")
-    print(f"Total weight: {total_weight:.3f} kg")
-    print(f"Read time: {result['elapsed']:.3f}s")
-    print(f"{'=' * 70}\n")
+    lines.extend([
+        f"{'-' * 70}",
+        f"Valid sensors: {valid_count}/{len(weights)}",
+        f"Total weight: {total_weight:.3f} kg",
+        f"Read time: {result['elapsed']:.3f}s",
+        f"{'=' * 70}\n",
+    ])
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return total_weight, valid_count
 
 
+def parse_args(argv=None):
+    """Parse command line options (see parse_mux_args() for --config)."""
+    parser = mux_arg_parser(
+        "Read weight values from two MUXes on separate serial ports")
+    parser.add_argument('--port1', default='/dev/ttyUSB0', help="serial port of MUX 1")
+    parser.add_argument('--port2', default='/dev/ttyUSB1', help="serial port of MUX 2")
+    parser.add_argument(
+        '--interval', type=float, default=0.0, metavar='SECONDS',
+        help="wait between --repeat cycles (default: 0)")
+    return parse_mux_args(parser, argv)
+
+
+def print_all_results(results, total_time):
+    """
+    Print the per-MUX tables and the combined summary of one read cycle.
+
+    Args:
+        results: List of result dictionaries (see read_muxes_pipelined())
+        total_time: Wall time of the cycle in seconds
+    """
+    total_weight_all = 0.0
+    valid_count_all = 0
+    total_sensors = 0
+
+    for result in results:
+        if result and result['success']:
+            total_weight, valid_count = print_mux_results(result)
+            total_weight_all += total_weight
+            valid_count_all += valid_count
+            total_sensors += len(result['weights'])
+        elif result:
+            print(f"\n{'=' * 70}")
+            print(f"{result['label']}: FAILED")
+            print(f"{'=' * 70}")
+            print(f"Port: {result['port']}")
+            print(f"MUX ID: {result['mux_id']}")
+            print(f"Error: {result['error']}")
+            print(f"{'=' * 70}\n")
+
+    # Combined summary
+    if results[0] and results[1]:
+        print("=" * 70)
+        print("COMBINED SUMMARY")
+        print("=" * 70)
+        print(f"Total sensors: {total_sensors}")
+        print(f"Valid readings: {valid_count_all}/{total_sensors}")
+        print(f"Combined weight: {total_weight_all:.3f} kg")
+        print(f"Total read time: {total_time:.3f}s (parallel)")
+        print(f"{'=' * 70}")
+
+        # Calculate sequential time for comparison
+        seq_time = sum(r['elapsed'] for r in results if r and r['success'])
+        speedup = seq_time / total_time if total_time > 0 else 0
+        print(f"\nPerformance:")
+        print(f"  Parallel time: {total_time:.3f}s")
+        print(f"  Sequential time (estimated): {seq_time:.3f}s")
+        print(f"  Speedup: {speedup:.2f}x")
+        print("=" * 70)
+
+
 def main():
     """Main function."""
+    args = parse_args()
+
+    port1, mux1_id = args.port1, args.mux1_id
+    port2, mux2_id = args.port2, args.mux2_id
+    baudrate = args.baudrate or (FAST_BAUDRATE if args.fast_baud else 9600)
+    interactive = args.interactive or not (mux1_id or mux2_id)
+
     print("=" * 70)
     print("DIGIsens - Read Two MUXes on Separate Serial Ports (Parallel)")
     print("=" * 70)
     print("\nThis script is for setups where each MUX has its own USB converter.")
     print("Advantage: Parallel polling for faster performance!\n")
 
-    # Configuration for MUX 1
-    print("=== MUX 1 Configuration ===")
-    port1 = input("Enter serial port for MUX 1 [/dev/ttyUSB0]: ").strip() or "/dev/ttyUSB0"
-    mux1_id = input("Enter MUX 1 ID: ").strip()
+    if interactive:
+        # Configuration for MUX 1
+        print("=== MUX 1 Configuration ===")
+        port1 = ask("Enter serial port for MUX 1", port1)
+        mux1_id = ask("Enter MUX 1 ID", mux1_id)
 
-    # Configuration for MUX 2
-    print("\n=== MUX 2 Configuration ===")
-    port2 = input("Enter serial port for MUX 2 [/dev/ttyUSB1]: ").strip() or "/dev/ttyUSB1"
-    mux2_id = input("Enter MUX 2 ID: ").strip()
+        # Configuration for MUX 2
+        print("\n=== MUX 2 Configuration ===")
+        port2 = ask("Enter serial port for MUX 2", port2)
+        mux2_id = ask("Enter MUX 2 ID", mux2_id)
 
-    # Baudrate (usually same for both)
-    print("\n=== Communication Settings ===")
-    baudrate = input("Enter baudrate [9600]: ").strip() or "9600"
-    baudrate = int(baudrate)
+        # Baudrate (usually same for both)
+        print("\n=== Communication Settings ===")
+        baudrate = int(ask("Enter baudrate", baudrate))
 
     if not mux1_id or not mux2_id:
         print("\nError: Both MUX IDs are required!")
@@ -269,9 +642,10 @@ def main():
     if port1 == port2:
         print("\nWARNING: Both MUXes are on the same port!")
         print("This script is for SEPARATE ports. Use read_two_muxes.py instead.")
-        proceed = input("Continue anyway? (y/n): ").strip().lower()
-        if proceed != 'y':
-            return
+        if interactive:
+            proceed = input("Continue anyway? (y/n): ").strip().lower()
+            if proceed != 'y':
+                return
 
     # Detect addressing modes
     use_extended_1 = len(mux1_id) == 16
@@ -292,73 +666,50 @@ def main():
     print(f"Baudrate: {baudrate}")
     print(f"{'=' * 70}\n")
 
-    # Prepare for parallel reading
-    results = [None, None]  # Shared list for thread results
-
-    # Create threads for parallel reading
-    thread1 = threading.Thread(
-        target=read_mux_thread,
-        args=(port1, mux1_id, baudrate, use_extended_1, results, 0, "MUX 1")
-    )
-
-    thread2 = threading.Thread(
-        target=read_mux_thread,
-        args=(port2, mux2_id, baudrate, use_extended_2, results, 1, "MUX 2")
-    )
-
-    # Start both threads (parallel polling!)
-    print("Starting parallel polling...\n")
-    start_time = time.time()
-
-    thread1.start()
-    thread2.start()
+    mux_configs = [
+        (port1, mux1_id, use_extended_1, "MUX 1"),
+        (port2, mux2_id, use_extended_2, "MUX 2"),
+    ]
+
+    # Parallel reading: one event loop when pyserial-asyncio is available,
+    # a pipelined single-thread read otherwise (and on Windows, where serial
+    # asyncio support is less mature)
+    use_asyncio = serial_asyncio is not None and sys.platform != 'win32'
+    if use_asyncio:
+        print("Starting parallel polling (asyncio)...\n")
+    else:
+        # Single-thread pipeline: both requests are on the wire before
+        # either response is read
+        print("Starting parallel polling (pipelined)...\n")
+
+    if args.fast_baud:
+        results, cycle_times = poll_muxes(mux_configs, baudrate, 1, use_asyncio=use_asyncio)
+        results = [reread_at_probed_baudrate(config, result)
+                   for config, result in zip(mux_configs, results)]
+
+        # Later cycles go straight to the rate each MUX answered at
+        baudrate = [result.get('baudrate', baudrate) for result in results]
+
+        if args.repeat > 1:
+            time.sleep(args.interval)
+            results, more_cycle_times = poll_muxes(
+                mux_configs, baudrate, args.repeat - 1, args.interval, use_asyncio)
+            cycle_times += more_cycle_times
+    else:
+        results, cycle_times = poll_muxes(
+            mux_configs, baudrate, args.repeat, args.interval, use_asyncio)
 
-    # Wait for both threads to complete
-    thread1.join()
-    thread2.join()
+    total_time = cycle_times[-1]
 
-    total_time = time.time() - start_time
     print(f"\nBoth MUXes read in {total_time:.3f}s (parallel operation)\n")
 
-    # Display results
-    total_weight_all = 0.0
-    valid_count_all = 0
-    total_sensors = 0
+    print_all_results(results, total_time)
 
-    for result in results:
-        if result and result['success']:
-            total_weight, valid_count = print_mux_results(result)
-            total_weight_all += total_weight
-            valid_count_all += valid_count
-            total_sensors += len(result['weights'])
-        elif result:
-            print(f"\n{'=' * 70}")
-            print(f"{result['label']}: FAILED")
-            print(f"{'=' * 70}")
-            print(f"Port: {result['port']}")
-            print(f"MUX ID: {result['mux_id']}")
-            print(f"Error: {result['error']}")
-            print(f"{'=' * 70}\n")
-
-    # Combined summary
-    if results[0] and results[1]:
-        print("=" * 70)
-        print("COMBINED SUMMARY")
-        print("=" * 70)
-        print(f"Total sensors: {total_sensors}")
-        print(f"Valid readings: {valid_count_all}/{total_sensors}")
-        print(f"Combined weight: {total_weight_all:.3f} kg")
-        print(f"Total read time: {total_time:.3f}s (parallel)")
-        print(f"{'=' * 70}")
-
-        # Calculate sequential time for comparison
-        seq_time = sum(r['elapsed'] for r in results if r and r['success'])
-        speedup = seq_time / total_time if total_time > 0 else 0
-        print(f"\nPerformance:")
-        print(f"  Parallel time: {total_time:.3f}s")
-        print(f"  Sequential time (estimated): {seq_time:.3f}s")
-        print(f"  Speedup: {speedup:.2f}x")
-        print("=" * 70)
+    if args.repeat > 1:
+        print(f"\nRepeated reads: {args.repeat} cycles")
+        print(f"  Average cycle: {sum(cycle_times) / len(cycle_times):.4f}s")
+        print(f"  Fastest cycle: {min(cycle_times):.4f}s")
+        print(f"  Slowest cycle: {max(cycle_times):.4f}s")
 
     print("\nReading complete!")
 
@@ -6,186 +6,185 @@ Direct serial communication approach (similar to fabio_2.py)
 
 Usage:
     python read_two_muxes_simple.py
+    python read_two_muxes_simple.py --port /dev/ttyUSB0 --mux1-id 123 --mux2-id 124
 
 This script uses direct serial communication without the digisens_interface library.
 Based on the working fabio_2.py implementation.
 """
 
 import serial
+import sys
+import time
 
+from lowa_protocol import (
+    FAST_BAUDRATE, INTER_BYTE_TIMEOUT, PROBE_BAUDRATES, encoded_frame, parse_all_weights,
+    read_gl_response, verify_crc
+)
+from mux_cli import ask, mux_arg_parser, parse_mux_args
 
-def XOR_CRC_calculation(msg):
-    """
-    Calculate XOR checksum for LOWA protocol.
-
-    Args:
-        msg: Message string without checksum
 
-    Returns:
-        Hexadecimal checksum string (2 chars, uppercase)
+def read_mux_weights_from_bytes(ser, request):
     """
-    checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
-        checksum ^= byte
-    return str(hex(checksum)[2:]).upper().zfill(2)
-
+    Read all weights from a single MUX using a pre-encoded 'gl' request.
 
-def create_lowa_msg(head, uid, command, data):
-    """
-    Build a complete LOWA protocol message with checksum.
+    For polling a fixed MUX: the request is built once by the caller, so
+    each read only writes the bytes and parses the answer.
 
     Args:
-        head: Message prefix ('#' for extended, '@' for standard)
-        uid: MUX unique identifier
-        command: Command code (e.g., 'gl', 'gw', 'sz')
-        data: Additional data (e.g., channel number)
+        ser: Serial connection object
+        request: Encoded 'gl' request (see encoded_frame())
 
     Returns:
-        Complete message string with checksum and CR
+        List of tuples: (channel, weight, status, valid)
     """
-    # Calculate length (command + uid + data + 2 for checksum)
-    c_length = str(len(head + "00" + command + uid + data))
-    msg = head + c_length.zfill(2) + command + uid + data
+    # Both MUXes share the bus: drop a late answer from the previous request
+    ser.reset_input_buffer()
+    ser.write(request)
+
+    # Read response
+    raw_answer = read_gl_response(ser)
+    if raw_answer and not verify_crc(raw_answer):
+        raise ValueError(f"Checksum mismatch in response {raw_answer!r}")
 
-    # Calculate and add XOR-CRC
-    msg_crc = XOR_CRC_calculation(msg)
-    msg += msg_crc
+    # Parse response
+    # Response format: #LL{weight0}{weight1}...{weight7}{checksum}\r
+    # Skip prefix (1 char) and length (2 chars) = 3 chars
+    # Remove checksum (2 chars) and CR (1 char) from end = -3 chars
+    data = memoryview(raw_answer)[3:-3]
+
+    weights = parse_all_weights(data)
 
-    return msg + "\r"
+    return weights
 
 
-def parse_weight_response(response, channel_idx):
+def probe_baudrate(ser, request, baudrates=PROBE_BAUDRATES):
     """
-    Parse a single weight value from the response.
+    Switch an open port to the first baudrate the MUX answers at.
 
     Args:
-        response: 11-character weight block
-        channel_idx: Channel number for display
+        ser: Serial connection object
+        request: Encoded 'gl' request for the MUX (see encoded_frame())
+        baudrates: Rates to try, in order
 
     Returns:
-        Tuple of (channel, weight, status, valid)
+        Baudrate now set on ser, or None (original baudrate restored)
     """
-    # Format: {sign}{8-char-weight}{status}
-    # Example: " 0002.130 " or "-0001.250M"
-    sign = response[0]
-    weight_str = response[1:9].strip()
-    status_char = response[9]
-
-    # Parse weight
-    try:
-        weight = float(weight_str)
-        if sign == '-':
-            weight = -weight
-    except ValueError:
-        weight = 0.0
-        status_char = 'E'
-
-    # Parse status
-    status_map = {
-        ' ': 'OK',
-        'M': 'MOTION',
-        'C': 'NOT_CONNECTED',
-        'E': 'EEPROM_ERROR'
-    }
-    status = status_map.get(status_char, 'UNKNOWN')
-    valid = (status_char == ' ')
-
-    return (channel_idx, weight, status, valid)
+    original = ser.baudrate
+    for baudrate in baudrates:
+        ser.baudrate = baudrate
+        ser.reset_input_buffer()
+        try:
+            if read_mux_weights_from_bytes(ser, request):
+                return baudrate
+        except ValueError:
+            pass  # Garbled answer, typical for a wrong baudrate
+    ser.baudrate = original
+    return None
 
 
-def read_mux_weights(ser, mux_id, use_extended=True):
+def read_mux_weights_probing(ser, request):
     """
-    Read all weights from a single MUX.
+    read_mux_weights_from_bytes(), probing the baudrate if the MUX does not answer.
 
     Args:
         ser: Serial connection object
-        mux_id: MUX identifier (3-digit or 16-char)
-        use_extended: Use extended addressing mode (default: True)
+        request: Encoded 'gl' request for the MUX (see encoded_frame())
 
     Returns:
         List of tuples: (channel, weight, status, valid)
     """
-    # Build command to get all weights
-    head = '#' if use_extended else '@'
-    msg = create_lowa_msg(head, mux_id, "gl", "")
-
-    # Send command
-    ser.write(str.encode(msg))
+    try:
+        weights = read_mux_weights_from_bytes(ser, request)
+    except ValueError:
+        weights = []
+    if weights:
+        return weights
 
-    # Read response
-    mux_answer = ser.read_until(b"\r").decode("utf-8")
+    print(f"No valid answer at {ser.baudrate} baud, probing baudrates...")
+    baudrate = probe_baudrate(ser, request)
+    if baudrate is None:
+        raise ValueError(f"No answer at any of {PROBE_BAUDRATES}")
 
-    # Parse response
-    # Response format: #LL{weight0}{weight1}...{weight7}{checksum}\r
-    # Skip prefix (1 char) and length (2 chars) = 3 chars
-    # Remove checksum (2 chars) and CR (1 char) from end = -3 chars
-    data = mux_answer[3:-3]
+    print(f"MUX answers at {baudrate} baud")
+    return read_mux_weights_from_bytes(ser, request)
 
-    # Each weight is 11 characters
-    weights = []
-    for i in range(0, len(data), 11):
-        weight_block = data[i:i+11]
-        if len(weight_block) == 11:
-            channel_idx = i // 11
-            parsed = parse_weight_response(weight_block, channel_idx)
-            weights.append(parsed)
 
-    return weights
+# Table header shared by every print_mux_results() call
+_RESULTS_HEADER = "\n".join([
+    f"{'=' * 70}",
+    f"{'Channel':<10} {'Weight (kg)':<15} {'Status':<15} {'Valid':<10}",
+    f"{'-' * 70}",
+])
 
 
 def print_mux_results(mux_id, weights, label="MUX"):
     """
-    Print formatted results for one MUX.
+    Print formatted results for one MUX in a single stdout write.
 
     Args:
         mux_id: MUX identifier
         weights: List of (channel, weight, status, valid) tuples
         label: Display label
     """
-    print(f"\n{'=' * 70}")
-    print(f"{label}: {mux_id}")
-    print(f"{'=' * 70}")
-    print(f"{'Channel':<10} {'Weight (kg)':<15} {'Status':<15} {'Valid':<10}")
-    print(f"{'-' * 70}")
+    lines = [
+        f"\n{'=' * 70}",
+        f"{label}: {mux_id}",
+        _RESULTS_HEADER,
+    ]
 
     total_weight = 0.0
     valid_count = 0
 
     for channel, weight, status, valid in weights:
         status_icon = "✓" if valid else "✗"
-        print(f"{channel:<10} {weight:<15.3f} {status:<15} {status_icon:<10}")
+        lines.append(f"{channel:<10} {weight:<15.3f} {status:<15} {status_icon:<10}")
 
         if valid:
             total_weight += weight
             valid_count += 1
 
-    print(f"{'-' * 70}")
-    print(f"Valid sensors: {valid_count}/{len(weights)}")
-    print(f"Total weight: {total_weight:.3f} kg")
-    print(f"{'=' * 70}\n")
+    lines.extend([
+        f"{'-' * 70}",
+        f"Valid sensors: {valid_count}/{len(weights)}",
+        f"Total weight: {total_weight:.3f} kg",
+        f"{'=' * 70}\n",
+    ])
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return total_weight, valid_count
 
 
+def parse_args(argv=None):
+    """Parse command line options (see parse_mux_args() for --config)."""
+    parser = mux_arg_parser("Read weight values from two MUXes on one serial port")
+    parser.add_argument('--port', default='/dev/ttyUSB0', help="serial port")
+    return parse_mux_args(parser, argv)
+
+
 def main():
     """Main function."""
+    args = parse_args()
+    read = read_mux_weights_probing if args.fast_baud else read_mux_weights_from_bytes
+
+    port, mux1_id, mux2_id = args.port, args.mux1_id, args.mux2_id
+    baudrate = args.baudrate or (FAST_BAUDRATE if args.fast_baud else 9600)
+
     print("=" * 70)
     print("DIGIsens - Read Weight Values from Two MUXes (Simple Version)")
     print("=" * 70)
 
     # Configuration
-    port = input("\nEnter serial port [/dev/ttyUSB0]: ").strip() or "/dev/ttyUSB0"
-    baudrate = input("Enter baudrate [9600]: ").strip() or "9600"
-    baudrate = int(baudrate)
+    if args.interactive or not (mux1_id or mux2_id):
+        print()
+        port = ask("Enter serial port", port)
+        baudrate = int(ask("Enter baudrate", baudrate))
 
-    print("\nEnter first MUX ID:")
-    print("  - Standard mode: 3 digits (e.g., 123)")
-    print("  - Extended mode: 16 characters (e.g., 0120220429103142)")
-    mux1_id = input("MUX 1 ID: ").strip()
+        print("\nEnter first MUX ID:")
+        print("  - Standard mode: 3 digits (e.g., 123)")
+        print("  - Extended mode: 16 characters (e.g., 0120220429103142)")
+        mux1_id = ask("MUX 1 ID", mux1_id)
 
-    mux2_id = input("MUX 2 ID: ").strip()
+        mux2_id = ask("MUX 2 ID", mux2_id)
 
     if not mux1_id or not mux2_id:
         print("\nError: Both MUX IDs are required!")
@@ -198,6 +197,10 @@ def main():
     mode1 = "Extended (16-char)" if use_extended_1 else "Standard (3-digit)"
     mode2 = "Extended (16-char)" if use_extended_2 else "Standard (3-digit)"
 
+    # Encode the requests once, the reads below only write these bytes
+    req1 = encoded_frame('#' if use_extended_1 else '@', mux1_id, "gl", "")
+    req2 = encoded_frame('#' if use_extended_2 else '@', mux2_id, "gl", "")
+
     print(f"\nConfiguration:")
     print(f"  Serial Port: {port}")
     print(f"  Baudrate: {baudrate}")
@@ -211,15 +214,27 @@ def main():
         ser = serial.Serial()
         ser.baudrate = baudrate
         ser.timeout = 0.5  # 500ms timeout
+        ser.inter_byte_timeout = INTER_BYTE_TIMEOUT
         ser.port = port
         ser.open()
 
         print("Connected successfully!\n")
 
+        # Back-to-back reads for --repeat; the last cycle is displayed below
+        cycle_times = []
+        for _ in range(args.repeat - 1):
+            start_time = time.perf_counter()
+            for request in (req1, req2):
+                try:
+                    read(ser, request)
+                except Exception as e:
+                    print(f"Error: {e}")
+            cycle_times.append(time.perf_counter() - start_time)
+
         # Read from MUX 1
         print("Reading weights from MUX 1...")
         try:
-            weights1 = read_mux_weights(ser, mux1_id, use_extended_1)
+            weights1 = read(ser, req1)
             total1, valid1 = print_mux_results(mux1_id, weights1, "MUX 1")
         except Exception as e:
             print(f"Error reading MUX 1: {e}\n")
@@ -229,7 +244,7 @@ def main():
         # Read from MUX 2
         print("Reading weights from MUX 2...")
         try:
-            weights2 = read_mux_weights(ser, mux2_id, use_extended_2)
+            weights2 = read(ser, req2)
             total2, valid2 = print_mux_results(mux2_id, weights2, "MUX 2")
         except Exception as e:
             print(f"Error reading MUX 2: {e}\n")
@@ -246,6 +261,12 @@ def main():
             print(f"Combined weight: {total1 + total2:.3f} kg")
             print("=" * 70)
 
+        if cycle_times:
+            print(f"\nRepeated reads: {len(cycle_times)} timed cycles before the one shown")
+            print(f"  Average cycle: {sum(cycle_times) / len(cycle_times):.4f}s")
+            print(f"  Fastest cycle: {min(cycle_times):.4f}s")
+            print(f"  Slowest cycle: {max(cycle_times):.4f}s")
+
         # Close connection
         ser.close()
         print("\nReading complete!")
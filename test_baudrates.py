@@ -4,7 +4,6 @@ Test multiple baudrates to find the correct one using protocol 'ag' broadcast.
 Per LOWA protocol specification, this only works with ONE MUX connected.
 """
 import serial
-import time
 
 def test_baudrate(port, baudrate, use_extended=True):
     """
@@ -25,7 +24,8 @@ def test_baudrate(port, baudrate, use_extended=True):
             bytesize=serial.EIGHTBITS,
             parity=serial.PARITY_NONE,
             stopbits=serial.STOPBITS_ONE,
-            timeout=0.5
+            timeout=0.15,
+            inter_byte_timeout=0.005  # Return once the reply stops
         )
 
         # Build protocol 'ag' broadcast command per specification
@@ -33,16 +33,15 @@ def test_baudrate(port, baudrate, use_extended=True):
         prefix = '#' if use_extended else '@'
         message = f"{prefix}05ag"
         checksum = 0
-        for char in message:
-            checksum ^= ord(char)
+        for byte in message.encode('ascii'):
+            checksum ^= byte
         command = f"{message}{checksum:02X}\r"
 
         # Send command
         ser.write(command.encode('ascii'))
-        time.sleep(0.3)
 
-        # Read response
-        response = ser.read(100).decode('ascii', errors='ignore').strip()
+        # Read response (returns as soon as the CR arrives)
+        response = ser.read_until(b'\r', size=100).decode('ascii', errors='ignore').strip()
 
         ser.close()
 
@@ -73,14 +73,15 @@ def test_direct_read(port):
             timeout=1.0
         )
 
-        count = 0
-        while count < 30:  # 30 seconds
-            if ser.in_waiting:
-                data = ser.read(ser.in_waiting)
+        start = time.monotonic()
+        while time.monotonic() - start < 30:  # 30 seconds
+            # Blocks until a byte arrives (or the 1s timeout), then drains the rest
+            data = ser.read(1)
+            if data:
+                data += ser.read(ser.in_waiting)
                 print(f"Received {len(data)} bytes:", data.hex(), repr(data.decode('ascii', errors='ignore')))
-            time.sleep(1)
-            count += 1
-            print(f"  {count}s - Waiting...", end='\r')
+            else:
+                print(f"  {int(time.monotonic() - start)}s - Waiting...", end='\r')
 
         print("\n\nNo data received in 30 seconds.")
         print("\nThis confirms MUX is not sending data.")
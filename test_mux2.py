@@ -1,27 +1,121 @@
 #!/usr/bin/env python3
 """
 Quick test for MUX 2 - Try multiple methods
+
+Usage:
+    python test_mux2.py [--pipeline]
 """
 
+import functools
+import math
+import operator
 import serial
+import sys
 import time
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, see requirements.txt
+    np = None
+
+from lowa_protocol import xor_crc
+
+STATUS_MAP = {b' ': 'OK', b'M': 'MOTION', b'C': 'NOT_CONNECTED', b'E': 'EEPROM_ERROR'}
 
-def XOR_CRC_calculation(msg):
-    checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
-        checksum ^= byte
-    return str(hex(checksum)[2:]).upper().zfill(2)
+# Status name indexed by the status byte value, for table lookups instead of hashing
+STATUS_TABLE = ['UNKNOWN'] * 256
+for _flag, _name in STATUS_MAP.items():
+    STATUS_TABLE[_flag[0]] = _name
+STATUS_TABLE = tuple(STATUS_TABLE)
+STATUS_TABLE_NP = np.array(STATUS_TABLE) if np else None
+
+# One 11-byte weight block of a 'gl' response
+GL_BLOCK = np.dtype([('sign', 'S1'), ('weight', 'S8'), ('status', 'S1'), ('pad', 'S1')]) if np else None
+
+# --pipeline: send the TEST 2 and TEST 3 requests back-to-back
+PIPELINE = '--pipeline' in sys.argv[1:]
 
 
 def create_lowa_msg(head, uid, command, data):
-    c_length = str(len(head + "00" + command + uid + data))
-    msg = head + c_length.zfill(2) + command + uid + data
-    msg_crc = XOR_CRC_calculation(msg)
-    msg += msg_crc
-    return msg + "\r"
+    # Length counts head, the two length digits and the payload
+    payload = f"{command}{uid}{data}"
+    msg = f"{head}{len(head) + 2 + len(payload):02d}{payload}"
+    return f"{msg}{xor_crc(msg)}\r".encode('ascii')
+
+
+def read_until_terminator(ser, term=b'\r', max_bytes=256, deadline_s=1.0, count=1):
+    # Keep reading until `count` terminators, max_bytes or the deadline: a
+    # single read can return early while a slow MUX is still transmitting
+    buf = bytearray()
+    end = time.monotonic() + deadline_s
+    while buf.count(term) < count and len(buf) < max_bytes and time.monotonic() < end:
+        chunk = ser.read(max(1, ser.in_waiting))
+        if chunk:
+            buf += chunk
+    return bytes(buf)
+
+
+def parse_gl_blocks(data):
+    # Parallel 'weight', 'status' (byte), 'status_name' and 'ok' columns of
+    # the 11-byte blocks, so statistics over a batch are single NumPy calls.
+    # With NumPy the blocks are viewed as one structured array and converted
+    # in a single pass; a garbled block falls back to the per-channel loop,
+    # where an unparsable weight is NaN and never ok.
+    num_sensors = len(data) // 11
+    if np is not None and num_sensors:
+        try:
+            blocks = np.frombuffer(data, dtype=GL_BLOCK, count=num_sensors)
+            weights = np.char.strip(blocks['weight']).astype(np.float64)
+        except ValueError:
+            pass
+        else:
+            weights *= np.where(blocks['sign'] == b'-', -1.0, 1.0)
+            status_bytes = blocks['status'].view(np.uint8)
+            return {
+                'weight': weights,
+                'status': blocks['status'],
+                'status_name': STATUS_TABLE_NP[status_bytes],
+                'ok': status_bytes == 0x20,
+            }
+
+    weights, statuses, oks = [], [], []
+    for i in range(num_sensors):
+        block = data[i*11:(i+1)*11]
+        try:
+            weight = float(block[1:9].strip()) * (1 - 2 * (block[0:1] == b'-'))
+        except ValueError:
+            weight = float('nan')
+        weights.append(weight)
+        statuses.append(block[9:10])
+        oks.append(block[9:10] == b' ' and weight == weight)
+    if np is not None:
+        weights, oks = np.array(weights, dtype=np.float64), np.array(oks, dtype=bool)
+    return {
+        'weight': weights,
+        'status': statuses,
+        'status_name': [STATUS_TABLE[status[0]] for status in statuses],
+        'ok': oks,
+    }
+
+
+def make_framer(head, uid, command):
+    # Frame builder for one (head, uid, command): their XOR is folded once,
+    # each call only folds the length digits and the data
+    base_xor = functools.reduce(operator.xor, f"{head}{command}{uid}".encode('ascii'), 0)
+
+    def frame(data):
+        payload = f"{command}{uid}{data}"
+        length = f"{len(head) + 2 + len(payload):02d}"
+        crc = functools.reduce(operator.xor, f"{length}{data}".encode('ascii'), base_xor)
+        return f"{head}{length}{payload}{crc:02X}\r".encode('ascii')
+
+    return frame
+
+
+@functools.lru_cache(maxsize=256)
+def build_frame(head, uid, command, data):
+    # Frame built once per (head, uid, command, data)
+    return create_lowa_msg(head, uid, command, data)
 
 
 print("=" * 70)
@@ -36,27 +130,31 @@ print(f"MUX ID: {mux_id}")
 print(f"Mode: Extended (16-char)")
 print()
 
+# One port handle for all three tests
+try:
+    ser = serial.Serial(port, baudrate=9600, timeout=1.0)
+except serial.SerialException as e:
+    print(f"✗ Error: {e}")
+    sys.exit(1)
+
 # Test 1: Try to detect MUX with broadcast
 print("TEST 1: Broadcast MUX detection")
 print("-" * 70)
 try:
-    ser = serial.Serial(port, baudrate=9600, timeout=1.0)
     ser.reset_input_buffer()
     ser.reset_output_buffer()
 
     # Broadcast command to get MUX ID
-    broadcast_cmd = "#05ag20\r"
-    print(f"Sending: {repr(broadcast_cmd[:-1])}")
-    ser.write(str.encode(broadcast_cmd))
-    ser.flush()
+    broadcast_cmd = build_frame("#", "", "ag", "")
+    print(f"Sending: {repr(broadcast_cmd[:-1].decode('ascii'))}")
+    ser.write(broadcast_cmd)
 
-    response = ser.read_until(b'\r')
+    response = read_until_terminator(ser)
     print(f"Response: {repr(response)}")
 
     if response:
-        decoded = response.decode('utf-8')
-        print(f"Decoded: {repr(decoded)}")
-        detected_id = decoded[3:-3]  # Extract ID
+        print(f"Decoded: {repr(response.decode('ascii', errors='replace'))}")
+        detected_id = response[3:-3].decode('ascii')  # Extract ID
         print(f"Detected MUX ID: {detected_id}")
 
         if detected_id != mux_id:
@@ -65,62 +163,67 @@ try:
             mux_id = detected_id
     else:
         print("✗ No response to broadcast")
-
-    ser.close()
-    time.sleep(0.1)
 except Exception as e:
     print(f"✗ Error: {e}")
 
 print()
 
+gl_frame = make_framer("#", mux_id, "gl")
+gd_frame = make_framer("#", mux_id, "gd")
+
+# With --pipeline both requests go out at once and both answers are read
+# afterwards; if either times out, the tests below send their own requests
+pipelined = {}
+if PIPELINE:
+    frames = (gl_frame(""), gd_frame("00"))
+    try:
+        ser.reset_input_buffer()
+        ser.write(b"".join(frames))
+        # A read can return the start of the next answer too, so read both
+        # answers into one buffer and split it on the terminators
+        raw = read_until_terminator(ser, max_bytes=256 * len(frames), count=len(frames))
+        responses = [answer + b'\r' for answer in raw.split(b'\r')[:-1]]
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        responses = []
+    if len(responses) == len(frames):
+        pipelined = dict(zip(frames, responses))
+    else:
+        print("Pipelined requests timed out, sending them one by one\n")
+
 # Test 2: Try 'gl' command (get all weights - faster, like fabio_2.py)
 print("TEST 2: 'gl' command (Get All Weights)")
 print("-" * 70)
 try:
-    ser = serial.Serial(port, baudrate=9600, timeout=1.0)
-    ser.reset_input_buffer()
-    ser.reset_output_buffer()
-
-    msg = create_lowa_msg("#", mux_id, "gl", "")
-    print(f"Command: {repr(msg[:-1])}")
-
-    ser.write(str.encode(msg))
-    ser.flush()
-
-    response = ser.read_until(b'\r')
+    frame = gl_frame("")
+    print(f"Command: {repr(frame[:-1].decode('ascii'))}")
+
+    response = pipelined.get(frame)
+    if response is None:
+        ser.reset_input_buffer()
+        ser.reset_output_buffer()
+        ser.write(frame)
+        response = read_until_terminator(ser)
     print(f"Response length: {len(response)} bytes")
 
     if response:
-        decoded = response.decode('utf-8')
-        print(f"Response: {repr(decoded)}")
+        print(f"Response: {repr(response.decode('ascii', errors='replace'))}")
 
         # Parse response
-        data = decoded[3:-3]  # Skip prefix+length, remove checksum+CR
+        data = response[3:-3]  # Skip prefix+length, remove checksum+CR
         num_sensors = len(data) // 11
         print(f"Number of sensors: {num_sensors}")
         print()
 
-        for i in range(num_sensors):
-            block = data[i*11:(i+1)*11]
-            if len(block) == 11:
-                sign = block[0]
-                weight_str = block[1:9].strip()
-                status = block[9]
-                try:
-                    weight = float(weight_str)
-                    if sign == '-':
-                        weight = -weight
-                    status_map = {' ': 'OK', 'M': 'MOTION', 'C': 'NOT_CONNECTED', 'E': 'EEPROM_ERROR'}
-                    status_name = status_map.get(status, 'UNKNOWN')
-                    valid = "✓" if status == ' ' else "✗"
-                    print(f"  Channel {i}: {weight:8.3f} kg [{status_name}] {valid}")
-                except:
-                    print(f"  Channel {i}: Parse error")
+        parsed = parse_gl_blocks(data)
+        for i, (weight, status_name, ok) in enumerate(zip(parsed['weight'], parsed['status_name'], parsed['ok'])):
+            if math.isnan(weight):
+                print(f"  Channel {i}: Parse error")
+                continue
+            valid = "✓" if ok else "✗"
+            print(f"  Channel {i}: {weight:8.3f} kg [{status_name}] {valid}")
     else:
         print("✗ No response (timeout)")
-
-    ser.close()
-    time.sleep(0.1)
 except Exception as e:
     print(f"✗ Error: {e}")
 
@@ -130,46 +233,40 @@ print()
 print("TEST 3: 'gd' command on Channel 0")
 print("-" * 70)
 try:
-    ser = serial.Serial(port, baudrate=9600, timeout=1.0)
-    ser.reset_input_buffer()
-    ser.reset_output_buffer()
-
     # gd command: channel 0, mode 0 (weight)
-    msg = create_lowa_msg("#", mux_id, "gd", "00")
-    print(f"Command: {repr(msg[:-1])}")
-
-    ser.write(str.encode(msg))
-    ser.flush()
-
-    response = ser.read_until(b'\r')
+    frame = gd_frame("00")
+    print(f"Command: {repr(frame[:-1].decode('ascii'))}")
+
+    response = pipelined.get(frame)
+    if response is None:
+        ser.reset_input_buffer()
+        ser.reset_output_buffer()
+        ser.write(frame)
+        response = read_until_terminator(ser)
     print(f"Response length: {len(response)} bytes")
 
     if response:
-        decoded = response.decode('utf-8')
-        print(f"Response: {repr(decoded)}")
+        print(f"Response: {repr(response.decode('ascii', errors='replace'))}")
 
-        if len(decoded) >= 14:
-            sign = decoded[3]
-            weight_str = decoded[4:13].strip()
-            status = decoded[13]
+        if len(response) >= 14:
+            sign = response[3:4]
+            weight_str = response[4:13].strip()
+            status = response[13:14]
 
-            weight = float(weight_str)
-            if sign == '-':
-                weight = -weight
+            weight = float(weight_str) * (1 - 2 * (sign == b'-'))
 
-            status_map = {' ': 'OK', 'M': 'MOTION', 'C': 'NOT_CONNECTED', 'E': 'EEPROM_ERROR'}
-            status_name = status_map.get(status, f'UNKNOWN({repr(status)})')
+            status_name = STATUS_MAP.get(status, f"UNKNOWN({status.decode('latin-1')!r})")
 
             print(f"\nResult:")
             print(f"  Weight: {weight:.3f} kg")
             print(f"  Status: {status_name}")
     else:
         print("✗ No response (timeout)")
-
-    ser.close()
 except Exception as e:
     print(f"✗ Error: {e}")
 
+ser.close()
+
 print()
 print("=" * 70)
 print("DIAGNOSIS")
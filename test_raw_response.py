@@ -2,42 +2,95 @@
 """
 Capture raw hex data from MUX to diagnose baudrate/protocol issues.
 """
+import os
+import re
+import select
 import serial
 import time
 
-def test_raw_response(port, baudrate):
-    """Send broadcast command and capture raw response."""
+try:
+    import fcntl
+except ImportError:  # Windows: reads poll in_waiting instead
+    fcntl = None
+
+# Bytes outside printable ASCII, shown as <XX> in the debug output
+NON_PRINTABLE = re.compile(rb'[^\x20-\x7e]')
+
+def read_until_terminator(ser, term=b'\r', max_bytes=256, deadline_s=1.0):
+    """
+    Read until the terminator, max_bytes or the deadline.
+
+    A single read can return early while a slow MUX is still transmitting.
+    On POSIX the port's file descriptor is read directly: select() waits
+    for data and one non-blocking os.read() takes everything that has
+    arrived, skipping pyserial's read wrapper. Elsewhere whatever has
+    arrived is read in one call as soon as in_waiting reports it.
+    """
+    buf = bytearray()
+    end = time.monotonic() + deadline_s
+
+    if fcntl is not None:
+        fd = ser.fileno()
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        try:
+            while not buf.endswith(term) and len(buf) < max_bytes:
+                remaining = end - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    break
+                try:
+                    chunk = os.read(fd, max_bytes - len(buf))
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    break  # Port went away
+                buf += chunk
+        finally:
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags)
+        return bytes(buf)
+
+    while time.monotonic() < end:
+        n = ser.in_waiting
+        if n:
+            buf += ser.read(n)
+            if buf.endswith(term) or len(buf) >= max_bytes:
+                break
+        else:
+            time.sleep(0.002)
+    return bytes(buf)
+
+def test_raw_response(ser, baudrate):
+    """
+    Send broadcast command and capture raw response.
+
+    The port stays open between probes; only its baudrate is changed
+    (pyserial applies this live on most drivers), so no probe pays for a
+    port open/close.
+    """
     print(f"\n{'='*60}")
     print(f"Testing baudrate: {baudrate}")
     print('='*60)
 
     try:
-        ser = serial.Serial(
-            port=port,
-            baudrate=baudrate,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            timeout=1.0
-        )
+        ser.baudrate = baudrate
+        ser.reset_input_buffer()
 
         # Build extended mode broadcast: #05ag
         message = "#05ag"
         checksum = 0
-        for char in message:
-            checksum ^= ord(char)
-        command = f"{message}{checksum:02X}\r"
+        for byte in message.encode('ascii'):
+            checksum ^= byte
+        command = f"{message}{checksum:02X}\r".encode('ascii')
 
-        print(f"Sending: {repr(command)}")
-        print(f"Hex:     {command.encode('ascii').hex()}")
+        print(f"Sending: {repr(command.decode('ascii'))}")
+        print(f"Hex:     {command.hex()}")
 
         # Send command
-        ser.write(command.encode('ascii'))
-        ser.flush()
-        time.sleep(0.5)
+        ser.write(command)
 
-        # Read raw bytes
-        raw_response = ser.read(100)
+        # Read raw bytes (returns as soon as the CR arrives; a garbled
+        # reply without CR is collected until the deadline)
+        raw_response = read_until_terminator(ser)
 
         if raw_response:
             print(f"\n✓ Received {len(raw_response)} bytes")
@@ -45,12 +98,8 @@ def test_raw_response(port, baudrate):
             print(f"Raw bytes: {list(raw_response)}")
 
             # Try to show ASCII where possible
-            ascii_attempt = ""
-            for byte in raw_response:
-                if 32 <= byte <= 126:  # Printable ASCII
-                    ascii_attempt += chr(byte)
-                else:
-                    ascii_attempt += f"<{byte:02X}>"
+            ascii_attempt = NON_PRINTABLE.sub(
+                lambda m: b"<%02X>" % m.group()[0], raw_response).decode('ascii')
             print(f"ASCII interpretation: {ascii_attempt}")
 
             # Check if it looks like valid response
@@ -64,11 +113,9 @@ def test_raw_response(port, baudrate):
             else:
                 print("\n✗ Response doesn't start with @ or # (garbled - wrong baudrate)")
 
-            ser.close()
             return True
         else:
             print("✗ No response")
-            ser.close()
             return False
 
     except Exception as e:
@@ -91,13 +138,27 @@ if __name__ == '__main__':
     print("to diagnose baudrate and protocol issues.")
     print("="*60)
 
-    valid_found = False
-    for baud in baudrates:
-        result = test_raw_response(port, baud)
-        if result:
-            # Check if response looks valid (starts with @ or #)
-            pass  # Will be shown in the test output
-        time.sleep(0.5)
+    try:
+        ser = serial.Serial(
+            port=port,
+            baudrate=baudrates[0],
+            bytesize=serial.EIGHTBITS,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=0.3
+        )
+    except serial.SerialException as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    try:
+        for baud in baudrates:
+            result = test_raw_response(ser, baud)
+            if result:
+                # Check if response looks valid (starts with @ or #)
+                pass  # Will be shown in the test output
+    finally:
+        ser.close()
 
     print("\n" + "="*60)
     print("SUMMARY")
@@ -3,19 +3,13 @@
 Verify protocol implementation against PDF examples
 """
 
-def XOR_CRC_calculation(msg):
-    checksum = 0
-    byte_str = bytearray()
-    byte_str.extend(map(ord, msg))
-    for byte in byte_str:
-        checksum ^= byte
-    return str(hex(checksum)[2:]).upper().zfill(2)
+from lowa_protocol import xor_crc
 
 def create_lowa_msg_OLD(head, uid, command, data):
     """OLD implementation from fabio_2.py"""
     c_length = str(len(head + "00" + command + uid + data))
     msg = head + c_length.zfill(2) + command + uid + data
-    msg_crc = XOR_CRC_calculation(msg)
+    msg_crc = xor_crc(msg)
     msg += msg_crc
     return msg + "\r"
 
@@ -27,7 +21,7 @@ def create_lowa_msg_CORRECT(head, uid, command, data):
     # Length = len(payload) + 2 (for checksum)
     c_length = str(len(payload) + 2)
     msg = head + c_length.zfill(2) + payload
-    msg_crc = XOR_CRC_calculation(msg)
+    msg_crc = xor_crc(msg)
     msg += msg_crc
     return msg + "\r"
 
@@ -57,7 +51,7 @@ print("   Command: gl (get all), MUX ID: 123")
 
 # Need to calculate expected checksum
 msg_without_checksum = "@08gl123"
-expected_checksum = XOR_CRC_calculation(msg_without_checksum)
+expected_checksum = xor_crc(msg_without_checksum)
 expected_full = msg_without_checksum + expected_checksum
 
 old_result = create_lowa_msg_OLD("@", "123", "gl", "")